@@ -1,7 +1,14 @@
+import os
 import dash
+from flask import Response, abort, jsonify, request
 import dash_bootstrap_components as dbc
 from layout import layout
 from callbacks import register_callbacks
+from s3_fetch import cache_stats, s3_client, S3_BUCKET
+from series_index import start_index_build
+from warmup import warmup, start_warmup
+from points import points_df, points_geojson
+from tiles import TILE_CACHE_TTL, TileError, get_tile
 
 # Initialize the Dash app
 app = dash.Dash(__name__, suppress_callback_exceptions=True, external_stylesheets=[dbc.themes.BOOTSTRAP,"https://cdnjs.cloudflare.com/ajax/libs/font-awesome/5.15.4/css/all.min.css"])
@@ -14,7 +21,59 @@ server = app.server
 # Register callbacks
 register_callbacks(app)
 
-# Run the server
+
+@server.route('/ready')
+def ready():
+    """Readiness probe: 503 until the cache warm-up has loaded enough of the catalogue."""
+    status = warmup.status()
+    return jsonify(status), 200 if status['ready'] else 503
+
+
+@server.route('/stats')
+def stats():
+    """Series cache counters of this worker: hits, misses, evictions, bytes held and coalesced fetches."""
+    return jsonify(cache_stats())
+
+
+@server.route('/points/<int:point_limit>.geojson')
+def points(point_limit):
+    """Points layer of the map; the URL carries the points.csv version, so it can be cached for long."""
+    if not 0 < point_limit <= len(points_df):
+        abort(404)
+    return Response(points_geojson(point_limit), mimetype='application/geo+json',
+                    headers={'Cache-Control': 'public, max-age=86400'})
+
+
+@server.route('/tiles/<tile_layer_id>/<int:z>/<int:x>/<int:y>.png')
+def tile(tile_layer_id, z, x, y):
+    """Map overlay tile from the local tile cache, fetched upstream on a miss (see tiles.py)."""
+    if z > 20 or x >= 2 ** z or y >= 2 ** z:
+        abort(404)
+    try:
+        body = get_tile(tile_layer_id, z, x, y, request.args.get('time'))
+    except KeyError:
+        abort(404)
+    except TileError:
+        abort(502)
+    return Response(body, mimetype='image/png',
+                    headers={'Cache-Control': f'public, max-age={int(min(TILE_CACHE_TTL, 86400))}'})
+
+
+def start_background_tasks():
+    """Start the background jobs of a host; under gunicorn a single worker runs them (see gunicorn.conf.py)."""
+    # Load every series into the caches; this also refreshes the metadata index
+    if warmup.enabled:
+        start_warmup(s3_client, S3_BUCKET)
+    # Index series that are not in the metadata index yet, so the date pickers never wait on S3
+    elif os.getenv('SERIES_INDEX_ON_STARTUP', '1') == '1':
+        start_index_build(s3_client, S3_BUCKET)
+
+
+# Run the development server; production serves wsgi:server with gunicorn
 if __name__ == '__main__':
-    app.run_server(debug=True)
+    debug = os.getenv('DASH_DEBUG', '0') == '1'
+    # The debug reloader runs this module twice; only its serving child starts the jobs
+    if not debug or os.environ.get('WERKZEUG_RUN_MAIN') == 'true':
+        start_background_tasks()
+    app.run_server(debug=debug)
 
@@ -0,0 +1,136 @@
+import os
+import json
+import time
+import hashlib
+import threading
+import pandas as pd
+import pyarrow as pa
+
+ATTRS_KEY = b'series_attrs'
+
+
+class SharedSeriesCache:
+    """Parsed series as uncompressed Arrow IPC files in a directory shared by every worker process.
+
+    Readers memory-map the files, so all processes share one copy of the data in the page
+    cache and a series parsed by one worker is available to the others without a reload.
+    Files are replaced by write-then-rename; frames already mapped keep the old file alive.
+    """
+
+    def __init__(self, directory, max_bytes, ttl=None):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def get(self, key):
+        """Return (frame, age in seconds) for `key`, or None when missing or expired."""
+        path = self._path(key)
+        try:
+            age = time.time() - os.stat(path).st_mtime
+        except OSError:
+            return None
+        if self.ttl and age > self.ttl:
+            return None
+        df = self._read(path)
+        return (df, age) if df is not None else None
+
+    def peek(self, key):
+        """Return the frame for `key` even if it has expired."""
+        return self._read(self._path(key))
+
+    def contains(self, key):
+        """Whether a frame, fresh or expired, is stored for `key`."""
+        return os.path.exists(self._path(key))
+
+    def put(self, key, df):
+        """Write a frame and return its memory-mapped copy (the frame itself if it cannot be written)."""
+        path = self._path(key)
+        tmp_path = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+        try:
+            table = _to_table(df)
+            with pa.OSFile(tmp_path, 'wb') as sink:
+                with pa.ipc.new_file(sink, table.schema) as writer:
+                    writer.write_table(table)
+            os.replace(tmp_path, path)
+        except (OSError, pa.ArrowException, TypeError, ValueError) as e:
+            print(f"Error writing shared cache entry {key}: {e}")
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            return df
+        self._evict()
+        mapped = self._read(path)
+        return mapped if mapped is not None else df
+
+    def touch(self, key):
+        """Restart the TTL of a stored frame, e.g. after its source revalidated unchanged."""
+        try:
+            os.utime(self._path(key))
+        except OSError:
+            pass
+
+    def invalidate(self, key):
+        try:
+            os.remove(self._path(key))
+        except OSError:
+            pass
+
+    def size(self):
+        return sum(size for _, size, _ in self._entries())
+
+    def _path(self, key):
+        return os.path.join(self.directory, hashlib.sha1(key.encode()).hexdigest() + '.arrow')
+
+    def _read(self, path):
+        try:
+            source = pa.memory_map(path, 'r')
+            table = pa.ipc.open_file(source).read_all()
+        except (OSError, pa.ArrowException):
+            return None
+        # Columns without nulls are handed to pandas as views of the mapped file
+        df = table.to_pandas(split_blocks=True)
+        metadata = table.schema.metadata or {}
+        if ATTRS_KEY in metadata:
+            attrs = json.loads(metadata[ATTRS_KEY])
+            if attrs.get('last_time') is not None:
+                attrs['last_time'] = pd.Timestamp(attrs['last_time'])
+            df.attrs.update(attrs)
+        return df
+
+    def _entries(self):
+        entries = []
+        for name in os.listdir(self.directory):
+            if not name.endswith('.arrow'):
+                continue
+            try:
+                stat = os.stat(os.path.join(self.directory, name))
+            except OSError:
+                continue
+            entries.append((name, stat.st_size, stat.st_mtime))
+        return entries
+
+    def _evict(self):
+        with self._lock:
+            entries = sorted(self._entries(), key=lambda entry: entry[2])
+            total = sum(size for _, size, _ in entries)
+            # Oldest writes go first
+            while entries and total > self.max_bytes:
+                name, size, _ = entries.pop(0)
+                try:
+                    os.remove(os.path.join(self.directory, name))
+                except OSError:
+                    pass
+                total -= size
+
+
+def _to_table(df):
+    # NaN stays a float value rather than becoming a null, so float columns map back without a copy
+    arrays = [pa.array(df[column].to_numpy(), from_pandas=False) for column in df.columns]
+    table = pa.Table.from_arrays(arrays, names=[str(column) for column in df.columns])
+    attrs = dict(df.attrs)
+    if attrs.get('last_time') is not None:
+        attrs['last_time'] = pd.Timestamp(attrs['last_time']).isoformat()
+    return table.replace_schema_metadata({ATTRS_KEY: json.dumps(attrs, default=str)})
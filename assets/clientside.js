@@ -0,0 +1,49 @@
+window.dash_clientside = Object.assign({}, window.dash_clientside, {
+    clientside: {
+        // Sidebar collapses: flip open/closed on each click
+        toggle_collapse: function(n, is_open) {
+            if (n) {
+                return !is_open;
+            }
+            return is_open;
+        },
+
+        // Guide modal: both the open and the close button flip it
+        toggle_modal: function(n1, n2, is_open) {
+            if (n1 || n2) {
+                return !is_open;
+            }
+            return is_open;
+        },
+
+        // Show the point or the polygon selector for the chosen AOI type
+        update_aoi_input: function(aoi_type) {
+            if (aoi_type === 'point') {
+                return [{'display': 'block'}, {'display': 'none'}];
+            } else if (aoi_type === 'polygon') {
+                return [{'display': 'none'}, {'display': 'block'}];
+            }
+            return [{'display': 'none'}, {'display': 'none'}];
+        },
+
+        // Width of the plot in pixels, used to size downsampled series
+        plot_width: function(id) {
+            const element = document.getElementById(id);
+            return element ? Math.round(element.getBoundingClientRect().width) : window.innerWidth;
+        },
+
+        // Map highlight: select a polygon through the layer's hideout, or show one pin for a point
+        update_highlight: function(data) {
+            const polygon = data && data.type === 'polygon' ? data.polygon : null;
+            const features = [];
+            if (data && data.type === 'point') {
+                features.push({
+                    'type': 'Feature',
+                    'geometry': {'type': 'Point', 'coordinates': [data.lon, data.lat]},
+                    'properties': {'point': data.point}
+                });
+            }
+            return [{'selected': polygon}, {'type': 'FeatureCollection', 'features': features}];
+        }
+    }
+});
@@ -0,0 +1,25 @@
+// Functions referenced by dash-leaflet components as dict(variable="seaf.map.<name>")
+window.seaf = Object.assign({}, window.seaf, {
+    map: {
+        // Only the polygon named in the hideout is drawn, in red
+        highlightStyle: function(feature, context) {
+            const selected = context.hideout ? context.hideout.selected : null;
+            if (selected !== null && feature.properties.polygon === selected) {
+                return {color: 'red', weight: 5, opacity: 1, fillOpacity: 0.1};
+            }
+            return {opacity: 0, fillOpacity: 0};
+        },
+
+        // Pin for the selected point
+        pinMarker: function(feature, latlng) {
+            const icon = L.icon({
+                iconUrl: '/assets/location-pin.png',
+                iconSize: [40, 41],
+                iconAnchor: [20, 41],
+                popupAnchor: [1, -34],
+                tooltipAnchor: [0, -28]
+            });
+            return L.marker(latlng, {icon: icon}).bindTooltip('Selected Point');
+        }
+    }
+});
@@ -1,167 +1,160 @@
-import os
-import boto3
 import pandas as pd
-import plotly.express as px
-import geopandas as gpd
-from dash import Input, Output, State, dcc, html
-from dash import Input, Output, State
+from dash import Input, Output, State, ClientsideFunction, Patch, no_update
+from dash.exceptions import PreventUpdate
 from pages.home import home_layout
-import dash_leaflet as dl
-#ghrsst_mur_layout, reflectance_layout, plankton_layout
-from pages.data_viz import olci_layout, ghrsst_mur_layout, plankton_layout, reflectance_layout, create_points_layer, points_df, geojson_data, transp_layout, optics_layout, pp_layout, ostia_layout, poc_layout, par_layout, pic_layout, mod_bio_layout, mod_nut_layout, mod_car_layout, mod_biomass_layout, mod_co2_layout, mod_optics_layout, mod_pfts_layout, mod_sal_layout
-from s3_fetch import s3_client, fetch_data_from_s3
-
-polygon_key_mapping = {str(i): f"Polygons_{i}_MultiPolygon.shp" for i in range(1, 7)}  # Ensure ".shp" extension
-variable_info = {
-    'CHL': {'label': 'Chlorophyll-a [mg/m³]', 'value': 'CHL'},
-    'analysed_sst': {
-        'label': {
-            'celsius': 'Sea Surface Temperature [°C]',
-            'kelvin': 'Sea Surface Temperature [°K]'
-        },
-        'value': 'analysed_sst'
-    },
-    'KD490': {'label': 'diffuse attenuation coefficient at 490 nm [m-¹]', 'value': 'KD490'},
-    'ZSD': {'label': 'Secchi disk depth [m]', 'value': 'ZSD'},
-    'SPM': {'label': 'Suspended particulate matter [g/m³]', 'value': 'SPM'},
-    'DIATO': {'label': 'Diatoms [mg m⁻³]', 'value': 'DIATO'},
-    'DINO': {'label': 'Dinoflagellates [mg m⁻³]', 'value': 'DINO'},
-    'GREEN': {'label': 'Green Algae [mg m⁻³]', 'value': 'GREEN'},
-    'HAPTO': {'label': 'Haptophytes [mg m⁻³]', 'value': 'HAPTO'},
-    'MICRO': {'label': 'Microplankton [mg m⁻³]', 'value': 'MICRO'},
-    'NANO': {'label': 'Nanoplankton [mg m⁻³]', 'value': 'NANO'},
-    'PICO': {'label': 'Picoplankton [mg m⁻³]', 'value': 'PICO'},
-    'PROCHLO': {'label': 'Prochlorococcus [mg m⁻³]', 'value': 'PROCHLO'},
-    'PROKAR': {'label': 'Prokaryotes [mg m⁻³]', 'value': 'PROKAR'},
-    'RRS412': {'label': 'RS reflectance at 412nm [sr⁻¹]', 'value': 'RRS412'},
-    'RRS443': {'label': 'RS reflectance at 443nm [sr⁻¹]', 'value': 'RRS443'},
-    'RRS490': {'label': 'RS reflectance at 490nm [sr⁻¹]', 'value': 'RRS490'},
-    'RRS555': {'label': 'RS reflectance at 555nm [sr⁻¹]', 'value': 'RRS555'},
-    'RRS670': {'label': 'RS reflectance at 670nm [sr⁻¹]', 'value': 'RRS670'},
-    'BBP': {'label': 'Backscattering coefficient [m⁻¹]', 'value': 'BBP'},
-    'CDM': {'label': 'Colored Dissolved Organic Matter [m⁻¹]', 'value': 'CDM'},
-    'PP': {'label': 'Primary Production [mg C m⁻² day⁻¹]', 'value': 'PP'},
-    'pic': {'label': 'Particulate Inorganic Carbon [mg m⁻³]', 'value': 'pic'},
-    'poc': {'label': 'Particulate Organic Carbon [mg m⁻³]', 'value': 'poc'},
-    'par': {'label': 'PAR [Einstein m⁻² d⁻¹]', 'value': 'par'},
-    'nppv': {'label': 'Net Primary Production [mg C m⁻² day⁻¹]', 'value': 'nppv'},
-    'o2': {'label': 'Dissolved Oxygen [mmol m⁻³]', 'value': 'o2'},
-    'fe': {'label': 'Dissolved Iron [mmol m⁻³]', 'value': 'fe'},
-    'si': {'label': 'Dissolved Silicate [mmol m⁻³]', 'value': 'si'},
-    'no3': {'label': 'Nitrate [mmol m⁻³]', 'value': 'no3'},
-    'po4': {'label': 'Phosphate [mmol m⁻³]', 'value': 'po4'},
-    'kd': {'label': 'Volume attenuation coefficient [m⁻¹]', 'value': 'kd'},
-    'talk': {'label': 'Total Alkalinity [mol m⁻³]', 'value': 'talk'},
-    'dissic': {'label': 'Dissolved Inorganic Carbon [mol m⁻³]', 'value': 'dissic'},
-    'spco2': {'label': 'Sea Surface pCO2 [Pa]', 'value': 'spco2'},
-    'chl': {'label': 'Chlorophyll-a [mg m⁻³]', 'value': 'chl'},
-    'phyc': {'label': 'Phytoplankton [mmol m⁻³]', 'value': 'phyc'},
-    'zooc': {'label': 'Zooplankton [g m⁻³]', 'value': 'zooc'},
-    'npp': {'label': 'Net Primary Production [mg C m⁻² day⁻¹]', 'value': 'npp'},
-    'so': {'label': 'Salinity [PSU]', 'value': 'so'},
-}
+from pages.data_viz import dataset_layout
+from points import point_options, points_df
+from datasets import POLYGON_COUNT, dataset_for_path, point_count, variable_label
+from plotting import add_range_band, time_values, timeseries_figure
+from downsample import downsample_series, target_points
+from s3_fetch import s3_client, fetch_data_from_s3, fetch_series_window, series_version, S3_BUCKET
+from series_index import series_id, series_index
+from rollups import ROLLUP_LEVELS, rollup_store
+from memo import memo
 
+polygon_key_mapping = {str(i): f"Polygons_{i}_MultiPolygon.shp" for i in range(1, POLYGON_COUNT + 1)}  # Ensure ".shp" extension
 
-def register_callbacks(app):
-    @app.callback(
-        Output("datasets-collapse", "is_open"),
-        [Input("datasets-button", "n_clicks")],
-        [State("datasets-collapse", "is_open")]
-    )
-    def toggle_datasets_collapse(n, is_open):
-        if n:
-            return not is_open
-        return is_open
 
-    @app.callback(
-        Output("globcolor-collapse", "is_open"),
-        [Input("globcolor-button", "n_clicks")],
-        [State("globcolor-collapse", "is_open")]
-    )
-    def toggle_globcolor_collapse(n, is_open):
-        if n:
-            return not is_open
-        return is_open
-    
-    @app.callback(
-        Output("sentinel-collapse", "is_open"),
-        [Input("sentinel-button", "n_clicks")],
-        [State("sentinel-collapse", "is_open")]
-    )
-    def toggle_sentinel_collapse(n, is_open):
-        if n:
-            return not is_open
-        return is_open
+def _plot_data(dataset_type, aoi_type, coordinate, variable, aggregation, start_date, end_date):
+    """Series (or rollup level) to plot within the date window: (df, title, aggregated), df None on failure."""
+    try:
+        df, title = fetch_data_from_s3(s3_client, S3_BUCKET, dataset_type, aoi_type, coordinate, variable)
+    except Exception as e:
+        print(f"Error fetching data from S3: {e}")
+        return None, None, False
+    if df is None or title is None or variable not in df.columns:
+        return None, None, False
 
-    @app.callback(
-        Output("ghrsst-collapse", "is_open"),
-        [Input("ghrsst-button", "n_clicks")],
-        [State("ghrsst-collapse", "is_open")]
-    )
-    def toggle_ghrsst_collapse(n, is_open):
-        if n:
-            return not is_open
-        return is_open
+    # Periodic statistics come from the rollup pyramid of the whole series
+    aggregated = aggregation in ROLLUP_LEVELS
+    if aggregated:
+        rollup_key = f'{series_id(dataset_type, aoi_type, coordinate)}/{variable}'
+        df = rollup_store.level(rollup_key, df, variable, aggregation)
 
-    @app.callback(
-        Output("modis-collapse", "is_open"),
-        [Input("modis-button", "n_clicks")],
-        [State("modis-collapse", "is_open")]
-    )
-    def toggle_modis_collapse(n, is_open):
-        if n:
-            return not is_open
-        return is_open
+    # Filter data by date range
+    if start_date and end_date:
+        df = df[(df['time'] >= start_date) & (df['time'] <= end_date)]
+    return df, title, aggregated
 
-    @app.callback(
-        Output("model-collapse", "is_open"),
-        [Input("model-button", "n_clicks")],
-        [State("model-collapse", "is_open")]
-    )
-    def toggle_model_collapse(n, is_open):
-        if n:
-            return not is_open
-        return is_open
 
-    @app.callback(
-        Output("pisces-collapse", "is_open"),
-        [Input("pisces-link", "n_clicks")],
-        [State("pisces-collapse", "is_open")]
-    )
-    def toggle_pisces_collapse(n, is_open):
-        if n:
-            return not is_open
-        return is_open
+def _patch_traces(figure, df, variable, aggregated):
+    """Replace the plotted arrays in a Patch, leaving layout, title and template untouched."""
+    x = time_values(df['time'])
+    if aggregated:
+        # The min-max band traces added by add_range_band come first, the mean trace last
+        figure['data'][0]['x'] = x
+        figure['data'][0]['y'] = df['max'].to_numpy()
+        figure['data'][1]['x'] = x
+        figure['data'][1]['y'] = df['min'].to_numpy()
+        figure['data'][2]['x'] = x
+        figure['data'][2]['y'] = df['mean'].to_numpy()
+        figure['data'][2]['customdata'] = df[['min', 'max', 'std', 'count']].to_numpy()
+    else:
+        figure['data'][0]['x'] = x
+        figure['data'][0]['y'] = df[variable].to_numpy()
 
-    @app.callback(
-        Output("seapodym-collapse", "is_open"),
-        [Input("seapodym-link", "n_clicks")],
-        [State("seapodym-collapse", "is_open")]
-    )
-    def toggle_seapodym_collapse(n, is_open):
-        if n:
-            return not is_open
-        return is_open
 
-    @app.callback(
-        Output("nemo-collapse", "is_open"),
-        [Input("nemo-link", "n_clicks")],
-        [State("nemo-collapse", "is_open")]
-    )
-    def toggle_nemo_collapse(n, is_open):
-        if n:
-            return not is_open
-        return is_open
-    @app.callback(
+def _within(start, end, loaded_start, loaded_end):
+    """Whether [start, end] lies inside the loaded window (an open window holds everything)."""
+    if not loaded_start or not loaded_end:
+        return True
+    return pd.Timestamp(loaded_start) <= pd.Timestamp(start) and pd.Timestamp(end) <= pd.Timestamp(loaded_end)
+
+
+def _date_range(dataset_type, aoi_type, coordinate, variable):
+    """[start, end] of a series from the metadata index; only series missing from it are fetched."""
+    entry = series_index.get(dataset_type, aoi_type, coordinate)
+    if entry is None:
+        try:
+            df, _ = fetch_data_from_s3(s3_client, S3_BUCKET, dataset_type, aoi_type, coordinate, variable)
+            if df is None:
+                return None
+        except Exception as e:
+            print(f"Error fetching data from S3: {e}")
+            return None
+        entry = series_index.get(dataset_type, aoi_type, coordinate)
+        if entry is None:
+            return None
+    return [entry['start'], entry['end']]
+
+
+def _build_plot(series, start_date, end_date, points=None):
+    """[figure, plot state] for a series and date window, downsampled to `points` unless None; None on failure."""
+    dataset_type, aoi_type, coordinate, variable, aggregation = series
+
+    # Fetch data from S3 and process it
+    df, title, aggregated = _plot_data(*series, start_date, end_date)
+    if df is None:
+        return None
+
+    # Draw about two points per pixel of plot width unless the full series was asked for
+    if points is not None:
+        df = downsample_series(df, variable, points)
+
+    # Axis label with units, as declared in the dataset registry
+    y_label = variable_label(dataset_type, variable)
+
+    # WebGL line chart in the dashboard template
+    fig = timeseries_figure(df, 'mean' if aggregated else variable, title, y_label)
+
+    if aggregated:
+        # Period mean with its spread, and the min-max range as a shaded band
+        fig.update_traces(
+            customdata=df[['min', 'max', 'std', 'count']].to_numpy(),
+            hovertemplate='%{x}: %{y:.2f} (min %{customdata[0]:.2f}, max %{customdata[1]:.2f}, '
+                          'sd %{customdata[2]:.2f}, n=%{customdata[3]})<extra></extra>'
+        )
+        add_range_band(fig, df, 'min', 'max')
+
+    # What the browser now holds, so later date and zoom changes can send only what is missing
+    plot_state = {'series': series, 'complete': points is None, 'start': start_date, 'end': end_date}
+    return [fig, plot_state]
+
+
+# Sidebar collapses and the control that toggles each of them
+SIDEBAR_COLLAPSES = [
+    ("datasets-collapse", "datasets-button"),
+    ("globcolor-collapse", "globcolor-button"),
+    ("sentinel-collapse", "sentinel-button"),
+    ("ghrsst-collapse", "ghrsst-button"),
+    ("modis-collapse", "modis-button"),
+    ("model-collapse", "model-button"),
+    ("pisces-collapse", "pisces-link"),
+    ("seapodym-collapse", "seapodym-link"),
+    ("nemo-collapse", "nemo-link"),
+]
+
+
+def register_callbacks(app):
+    # UI-only interactions run in the browser (assets/clientside.js), without a server round trip
+    for collapse_id, toggle_id in SIDEBAR_COLLAPSES:
+        app.clientside_callback(
+            ClientsideFunction(namespace="clientside", function_name="toggle_collapse"),
+            Output(collapse_id, "is_open"),
+            [Input(toggle_id, "n_clicks")],
+            [State(collapse_id, "is_open")]
+        )
+
+    app.clientside_callback(
+        ClientsideFunction(namespace="clientside", function_name="toggle_modal"),
         Output("guide-modal", "is_open"),
         [Input("open-guide-modal", "n_clicks"), Input("close-guide-modal", "n_clicks")],
         [State("guide-modal", "is_open")],
     )
-    def toggle_modal(n1, n2, is_open):
-        if n1 or n2:
-            return not is_open
-        return is_open
 
+    app.clientside_callback(
+        ClientsideFunction(namespace="clientside", function_name="update_aoi_input"),
+        [Output('point-selector', 'style'),
+        Output('polygon-selector', 'style')],
+        [Input('aoi-selector', 'value')]
+    )
+
+    # Measure the plot once it is rendered, so series are downsampled to its width
+    app.clientside_callback(
+        ClientsideFunction(namespace="clientside", function_name="plot_width"),
+        Output("plot-width", "data"),
+        [Input("output-plot", "id")]
+    )
 
     # Page routing
     @app.callback(
@@ -169,61 +162,18 @@ def register_callbacks(app):
         [Input("url", "pathname")]
     )
     def display_page(pathname):
-        if pathname == "/esa/sentinel/olci":
-            return olci_layout()
-        elif pathname == "/nasa/ghrsst/mur":
-            return ghrsst_mur_layout()
-        elif pathname == "/esa/globcolor/reflectance":
-            return reflectance_layout()
-        elif pathname == "/esa/globcolor/plankton":
-            return plankton_layout()
-        elif pathname == "/esa/globcolor/transp":
-            return transp_layout()
-        elif pathname == "/esa/globcolor/optics":
-            return optics_layout()
-        elif pathname == "/esa/globcolor/pp":
-            return pp_layout()
-        elif pathname == "/ukmo/ostia":
-            return ostia_layout()
-        elif pathname == "/nasa/modis/poc":
-            return poc_layout()
-        elif pathname == "/nasa/modis/par":
-            return par_layout()
-        elif pathname == "/nasa/modis/pic":
-            return pic_layout()
-        elif pathname == "/moi/model/pisces/bio":
-            return mod_bio_layout()
-        elif pathname == "/moi/model/pisces/nut":
-            return mod_nut_layout()
-        elif pathname == "/moi/model/pisces/car":
-            return mod_car_layout()
-        elif pathname == "/moi/model/seapodym/biomass":
-            return mod_biomass_layout()
-        elif pathname == "/moi/model/pisces/co2":
-            return mod_co2_layout()
-        elif pathname == "/moi/model/pisces/optics":
-            return mod_optics_layout()
-        elif pathname == "/moi/model/pisces/pfts":
-            return mod_pfts_layout()
-        elif pathname == "/moi/model/nemo/salinity":
-            return mod_sal_layout()      
+        dataset_type = dataset_for_path(pathname)
+        if dataset_type is not None:
+            return dataset_layout(dataset_type)
         return home_layout()
     
-    @app.callback(
-        [Output('point-selector', 'style'),
-        Output('polygon-selector', 'style')],
-        [Input('aoi-selector', 'value')]
-    )
-    def update_aoi_input(aoi_type):
-        if aoi_type == 'point':
-            return {'display': 'block'}, {'display': 'none'}
-        elif aoi_type == 'polygon':
-            return {'display': 'none'}, {'display': 'block'}
-        return {'display': 'none'}, {'display': 'none'}
-    
     @app.callback(
         [Output("start-date-picker", "date"),
-        Output("end-date-picker", "date")],
+        Output("end-date-picker", "date"),
+        Output("start-date-picker", "min_date_allowed"),
+        Output("start-date-picker", "max_date_allowed"),
+        Output("end-date-picker", "min_date_allowed"),
+        Output("end-date-picker", "max_date_allowed")],
         [Input("aoi-selector", "value"),
         Input("coordinate-input-point", "value"),
         Input("coordinate-input-polygon", "value"),
@@ -233,23 +183,21 @@ def register_callbacks(app):
     def update_date_pickers(aoi_type, point_coordinate, polygon_coordinate, variable, dataset_type):
         # Determine the coordinate based on AOI type
         coordinate = point_coordinate if aoi_type == 'point' else polygon_coordinate
+        if coordinate is None:
+            return None, None, None, None, None, None
 
-        # Fetch data from S3 and process it
-        try:
-            df, _ = fetch_data_from_s3(s3_client, 'wamsi-westport-project-1-1', dataset_type, aoi_type, coordinate, variable)
-            if df is None:
-                return None, None
-        except Exception as e:
-            print(f"Error fetching data from S3: {e}")
-            return None, None
+        # Straight from the metadata index; only series missing from it are fetched
+        date_range = _date_range(dataset_type, aoi_type, coordinate, variable)
+        if date_range is None:
+            return None, None, None, None, None, None
 
         # Extract start and end dates
-        start_date = df['time'].min()
-        end_date = df['time'].max()
+        start_date, end_date = date_range
 
-        return start_date, end_date
+        return start_date, end_date, start_date, end_date, start_date, end_date
     @app.callback(
-        Output("output-plot", "figure"),
+        [Output("output-plot", "figure"),
+        Output("plot-state", "data")],
         [Input("plot-button", "n_clicks")],
         [State("coordinate-input-point", "value"),
         State("coordinate-input-polygon", "value"),
@@ -257,82 +205,124 @@ def register_callbacks(app):
         State("start-date-picker", "date"),
         State("end-date-picker", "date"),
         State("aoi-selector", "value"),
-        State("dataset-type", "value")]
+        State("dataset-type", "value"),
+        State("full-resolution", "value"),
+        State("plot-width", "data"),
+        State("aggregation-selector", "value")]
     )
 
-    def update_plot(n_clicks, point_coordinate, polygon_coordinate, variable, start_date, end_date, aoi_type, dataset_type):
+    def update_plot(n_clicks, point_coordinate, polygon_coordinate, variable, start_date, end_date, aoi_type, dataset_type, full_resolution, plot_width, aggregation):
         if n_clicks is None:
-            return {}
+            return {}, None
 
         # Determine the coordinate based on AOI type
         coordinate = point_coordinate if aoi_type == 'point' else polygon_coordinate
+        series = [dataset_type, aoi_type, coordinate, variable, aggregation]
+
+        # Downsampled plots are keyed by their point budget, so similar plot widths share a result
+        complete = aggregation in ROLLUP_LEVELS or 'full' in (full_resolution or [])
+        points = None if complete else target_points(plot_width)
+
+        # Identical views are served from the memo store while the series version is unchanged
+        result = memo.cached(
+            'update_plot', {'series': series, 'start': start_date, 'end': end_date, 'points': points},
+            series_version(S3_BUCKET, dataset_type, aoi_type, coordinate),
+            lambda: _build_plot(series, start_date, end_date, points)
+        )
+        if result is None:
+            return {}, None
+        fig, plot_state = result
+
+        # uirevision keeps the user's zoom while the zoom callback swaps in data; each Plot click resets it
+        fig['layout']['uirevision'] = n_clicks
+        return fig, plot_state
 
-        # Fetch data from S3 and process it
+    # Move the plotted window when the From/To dates change, patching only what changed
+    @app.callback(
+        [Output("output-plot", "figure", allow_duplicate=True),
+        Output("plot-state", "data", allow_duplicate=True)],
+        [Input("start-date-picker", "date"),
+        Input("end-date-picker", "date")],
+        [State("coordinate-input-point", "value"),
+        State("coordinate-input-polygon", "value"),
+        State("variable-selector", "value"),
+        State("aoi-selector", "value"),
+        State("dataset-type", "value"),
+        State("aggregation-selector", "value"),
+        State("plot-state", "data"),
+        State("plot-width", "data")],
+        prevent_initial_call=True
+    )
+    def update_plot_window(start_date, end_date, point_coordinate, polygon_coordinate, variable, aoi_type, dataset_type, aggregation, plot_state, plot_width):
+        # Only a plot of the currently selected series is moved; anything else waits for Plot
+        coordinate = point_coordinate if aoi_type == 'point' else polygon_coordinate
+        if not plot_state or not start_date or not end_date:
+            raise PreventUpdate
+        if plot_state['series'] != [dataset_type, aoi_type, coordinate, variable, aggregation]:
+            raise PreventUpdate
+
+        figure = Patch()
+        figure['layout']['xaxis']['range'] = [start_date, end_date]
+        # A new window replaces any zoom the user had applied
+        figure['layout']['xaxis']['uirevision'] = f'{start_date}/{end_date}'
+
+        # Every point of the new window is already in the browser: move the axis only
+        if plot_state['complete'] and _within(start_date, end_date, plot_state['start'], plot_state['end']):
+            return figure, no_update
+
+        df, _, aggregated = _plot_data(*plot_state['series'], start_date, end_date)
+        if df is None:
+            raise PreventUpdate
+        if not plot_state['complete']:
+            df = downsample_series(df, variable, target_points(plot_width))
+        _patch_traces(figure, df, variable, aggregated)
+        return figure, {**plot_state, 'start': start_date, 'end': end_date}
+
+    # Re-resolve the plotted series for the visible time range when the user zooms or pans
+    @app.callback(
+        Output("output-plot", "figure", allow_duplicate=True),
+        [Input("output-plot", "relayoutData")],
+        [State("plot-state", "data"),
+        State("plot-width", "data")],
+        prevent_initial_call=True
+    )
+    def update_plot_resolution(relayout, plot_state, plot_width):
+        # Full-resolution and aggregated plots already hold every point they can show
+        if not relayout or not plot_state or plot_state['complete']:
+            raise PreventUpdate
+
+        # Visible x-range after a zoom or pan; a reset (autorange) goes back to the plotted dates
+        if 'xaxis.range[0]' in relayout:
+            start, end = relayout['xaxis.range[0]'], relayout['xaxis.range[1]']
+        elif 'xaxis.range' in relayout:
+            start, end = relayout['xaxis.range']
+        elif relayout.get('xaxis.autorange'):
+            start, end = plot_state['start'], plot_state['end']
+        else:
+            raise PreventUpdate
+
+        # Never beyond the plotted dates
+        if plot_state['start'] and plot_state['end']:
+            start = max(pd.Timestamp(start), pd.Timestamp(plot_state['start']))
+            end = min(pd.Timestamp(end), pd.Timestamp(plot_state['end']))
+
+        # Only the rows in view are copied out of the series cache filled by the Plot click
+        dataset_type, aoi_type, coordinate, variable, _ = plot_state['series']
         try:
-            df, title = fetch_data_from_s3(s3_client, 'wamsi-westport-project-1-1', dataset_type, aoi_type, coordinate, variable)
-            if df is None or title is None:
-                return {}
+            df = fetch_series_window(s3_client, S3_BUCKET, dataset_type, aoi_type, coordinate, variable, start, end)
         except Exception as e:
             print(f"Error fetching data from S3: {e}")
-            return {}
-
-        # Convert 'time' column to datetime if it exists
-        if 'time' in df.columns:
-            df['time'] = pd.to_datetime(df['time'])
-
-        # Filter data by date range
-        if start_date and end_date:
-            df = df[(df['time'] >= start_date) & (df['time'] <= end_date)]
-
-    # Retrieve the correct label for the variable based on dataset_type
-        if variable == 'analysed_sst':
-            # Check dataset type (celsius or kelvin)
-            if dataset_type == 'mur':
-                variable_label = variable_info['analysed_sst']['label']['celsius']
-            elif dataset_type == 'ostia':
-                variable_label = variable_info['analysed_sst']['label']['kelvin']
-            else:
-                variable_label = variable.capitalize()  # Fallback if dataset_type is unknown
-            # Since the data column remains 'analysed_sst' for both cases
-            variable_value = 'analysed_sst'
-        else:
-            # For other variables, retrieve the label normally
-            variable_info_entry = variable_info.get(variable, {})
-            variable_label = variable_info_entry.get('label', variable.capitalize())
-            variable_value = variable_info_entry.get('value', variable)
-
-        # Create the line chart
-        fig = px.line(df, x='time', y=variable_value, title=title)
-
-        # Update the layout to set the font, axis labels, and formatting
-        fig.update_layout(
-            font=dict(
-                family="Times New Roman",
-                size=18,  # Adjust font size as needed
-                color="Black"  # Adjust color as needed
-            ),
-            title=dict(
-                font=dict(size=24, color="#2c3e50"),  # Customize title font and color
-                x=0.5,  # Center the title
-                xanchor='center',
-                yanchor='top'
-            ),
-            xaxis_title="Time",  # Customize X-axis label
-            yaxis_title=variable_label,  # Y-axis label from `variable_info`
-            xaxis=dict(showgrid=False),  # Hide gridlines for cleaner look
-            yaxis=dict(showgrid=True, gridcolor='#dddddd'),  # Lighter gridlines for Y-axis
-            template="plotly_white",  # Apply a cleaner, modern template
-            plot_bgcolor='#fafafa',  # Light background color
-            hovermode="x unified",  # Unified hover tooltip for a cleaner display
-            margin=dict(l=50, r=50, t=50, b=50)  # Adjust margins for better spacing
-        )
+            raise PreventUpdate
+        if df is None or variable not in df.columns:
+            raise PreventUpdate
 
-        # Add hover text format (optional, for extra info on hover)
-        fig.update_traces(hovertemplate='%{x}: %{y:.2f}')
+        # At screen resolution
+        df = downsample_series(df, variable, target_points(plot_width))
 
-        return fig
+        figure = Patch()
+        _patch_traces(figure, df, variable, aggregated=False)
+        return figure
 
-    
      # Highlight point/polygon on the map when plot button is clicked
     @app.callback(
         Output("highlight-data", "data"),
@@ -344,60 +334,29 @@ def register_callbacks(app):
     def highlight_feature(n_clicks, point, polygon, aoi_type):
         if n_clicks is None:
             return {}
-        if aoi_type == 'polygon':
-            # Get the GeoJSON data of the selected polygon
-            polygon_key = polygon_key_mapping.get(polygon)
-            geojson = geojson_data.get(polygon_key)
-            if geojson:
-                return {'type': 'polygon', 'geojson': geojson}
-        elif aoi_type == 'point':
+        if aoi_type == 'polygon' and polygon in polygon_key_mapping:
+            return {'type': 'polygon', 'polygon': polygon}
+        elif aoi_type == 'point' and point:
             # Highlight the selected point
             lat = points_df.loc[int(point) - 1, 'latitude']
             lon = points_df.loc[int(point) - 1, 'longitude']
-            return {'type': 'point', 'lat': lat, 'lon': lon}
+            return {'type': 'point', 'point': point, 'lat': lat, 'lon': lon}
         return {}
 
-    # Update the map to highlight the selected point or polygon
+    # Point dropdown options found by search, so the page never embeds every station
     @app.callback(
-    [Output("points-layer", "children"), Output("highlighted-layer", "children")],
-    [Input("highlight-data", "data"),
-     Input("dataset-type", "value")]  # Add dataset-type input
-)
-    def update_map_highlight(data, dataset_type):
-        # Set point limit based on dataset_type
-        if dataset_type in ['olci', 'mur']:
-            point_limit = 32
-        else:
-            point_limit = 13
-
-        # Create points layer with point limit
-        points_layer = create_points_layer(point_limit)
-
-        # Initialize highlighted layer
-        highlighted_layer = []
-
-        if data:
-            if data['type'] == 'point':
-                # Highlight the point
-                highlighted_layer.append(dl.Marker(
-                    position=[data['lat'], data['lon']],
-                    id="highlighted-point",
-                    children=dl.Tooltip("Selected Point"),
-                    icon={
-                        "iconUrl": "/assets/location-pin.png",  # Path to the custom icon
-                        "iconSize": [40, 41],  # Size of the icon
-                        "iconAnchor": [20, 41],  # Anchor point of the icon
-                        "popupAnchor": [1, -34],  # Popup anchor point
-                        "tooltipAnchor": [0, -28]  # Tooltip anchor point
-                    }
-                ))
-            elif data['type'] == 'polygon':
-                # Highlight the polygon using GeoJSON
-                highlighted_layer.append(dl.GeoJSON(
-                    data=data['geojson'],
-                    id="highlighted-polygon",
-                    options=dict(style=dict(color="red", weight=5, fillOpacity=0.1))
-                ))
-
-        # Return updated points and highlighted layers
-        return points_layer, highlighted_layer
+        Output("coordinate-input-point", "options"),
+        Input("coordinate-input-point", "search_value"),
+        [State("coordinate-input-point", "value"),
+         State("dataset-type", "value")]
+    )
+    def update_point_options(search_value, value, dataset_type):
+        return point_options(point_count(dataset_type), search_value, value)
+
+    # Apply the highlight in the browser: the polygon layer's hideout and a one-feature point layer
+    app.clientside_callback(
+        ClientsideFunction(namespace="clientside", function_name="update_highlight"),
+        [Output("highlighted-polygon", "hideout"),
+         Output("highlighted-point", "data")],
+        [Input("highlight-data", "data")]
+    )
@@ -0,0 +1,84 @@
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from io import BytesIO
+from schemas import parse_csv
+
+# Data-lake prefix converted by the columnar job
+DATA_LAKE_PREFIX = 'csiem-data/data-lake/'
+
+
+def columnar_key(s3_key):
+    """Return the key of the Parquet copy of a CSV series."""
+    return s3_key[:-len('.csv')] + '.parquet' if s3_key.endswith('.csv') else s3_key + '.parquet'
+
+
+def to_parquet_bytes(df):
+    """Serialize a series as Parquet, sorted by time, one row group per year."""
+    df = df.copy()
+    df['time'] = pd.to_datetime(df['time'])
+    df = df.sort_values('time').reset_index(drop=True)
+    # Float32 keeps ~7 significant digits, more than any of the satellite or model products carry
+    for column in df.columns:
+        if column != 'time' and pd.api.types.is_float_dtype(df[column]):
+            df[column] = df[column].astype('float32')
+
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    buffer = BytesIO()
+    with pq.ParquetWriter(buffer, table.schema, compression='zstd') as writer:
+        years = df['time'].dt.year
+        for year in years.unique():
+            rows = (years == year).to_numpy().nonzero()[0]
+            writer.write_table(table.slice(rows[0], len(rows)))
+    return buffer.getvalue()
+
+
+def read_parquet_bytes(body, columns=None):
+    """Read a Parquet series, only the requested columns when `columns` is given."""
+    parquet_file = pq.ParquetFile(BytesIO(body))
+    names = parquet_file.schema_arrow.names
+    if columns is not None:
+        columns = [c for c in dict.fromkeys(['time'] + list(columns)) if c in names]
+    df = parquet_file.read(columns=columns).to_pandas()
+    df.attrs['columns'] = [c for c in names if c != 'time']
+    return df
+
+
+def convert_data_lake(s3_client, bucket, prefix=DATA_LAKE_PREFIX, overwrite=False):
+    """Write a Parquet copy next to every CSV series under `prefix` that lacks an up-to-date one.
+
+    Returns the number of series converted; run after each data update.
+    """
+    paginator = s3_client.get_paginator('list_objects_v2')
+    existing = {}
+    csv_objects = {}
+    for page in paginator.paginate(Bucket=bucket, Prefix=prefix):
+        for obj in page.get('Contents', []):
+            if obj['Key'].endswith('.parquet'):
+                existing[obj['Key']] = obj['LastModified']
+            elif obj['Key'].endswith('.csv'):
+                csv_objects[obj['Key']] = obj['LastModified']
+
+    converted = 0
+    for s3_key, modified in csv_objects.items():
+        target = columnar_key(s3_key)
+        if not overwrite and target in existing and existing[target] >= modified:
+            continue
+        try:
+            response = s3_client.get_object(Bucket=bucket, Key=s3_key)
+            df = parse_csv(response['Body'].read())
+            if 'time' not in df.columns:
+                continue
+            s3_client.put_object(Bucket=bucket, Key=target, Body=to_parquet_bytes(df))
+            converted += 1
+        except Exception as e:
+            print(f"Error converting {s3_key}: {e}")
+    return converted
+
+
+if __name__ == '__main__':
+    import sys
+    from s3_fetch import s3_client, S3_BUCKET
+
+    count = convert_data_lake(s3_client, S3_BUCKET, overwrite='--overwrite' in sys.argv)
+    print(f"Wrote {count} Parquet series under {DATA_LAKE_PREFIX}")
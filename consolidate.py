@@ -0,0 +1,77 @@
+import json
+import posixpath
+import pandas as pd
+from datetime import datetime, timezone
+from columnar import columnar_key, to_parquet_bytes
+from schemas import parse_csv, schema_for
+from datasets import DATASETS, is_bound, iter_series, series_keys
+
+# Manifest recording, for every consolidated series, where its two parts were spliced
+MANIFEST_KEY = 'csiem-data/data-lake/consolidated_manifest.json'
+
+
+def consolidated_key(s3_key):
+    """Return the key of the consolidated series for the current-period object `s3_key`."""
+    directory, name = posixpath.split(s3_key)
+    return posixpath.join(directory, 'consolidated', name)
+
+
+def merge_series(current, historical):
+    """Merge a current-period and a historical frame into one series sorted by time.
+
+    Both frames must already be typed (see schemas.parse_csv). Where the two overlap the
+    current-period rows win, so the newest processing is kept.
+    """
+    merged = pd.concat([current, historical], axis=0, ignore_index=True)
+    # A stable sort keeps current rows ahead of historical ones with the same timestamp
+    merged = merged.sort_values(by='time', kind='mergesort')
+    merged = merged.drop_duplicates(subset=['time']).reset_index(drop=True)
+    return merged
+
+
+def splice_info(current, historical, s3_key1, s3_key2):
+    return {
+        'splice_time': current['time'].min().isoformat(),
+        'historical_end': historical['time'].max().isoformat(),
+        'sources': [s3_key1, s3_key2],
+    }
+
+
+def consolidate_series(s3_client, bucket, s3_key1, s3_key2, schema=None):
+    """Merge one pair of objects and write the consolidated CSV and its Parquet copy; returns the splice record."""
+    current = parse_csv(s3_client.get_object(Bucket=bucket, Key=s3_key1)['Body'].read(), schema)
+    historical = parse_csv(s3_client.get_object(Bucket=bucket, Key=s3_key2)['Body'].read(), schema)
+    merged = merge_series(current, historical)
+    splice = splice_info(current, historical, s3_key1, s3_key2)
+
+    target = consolidated_key(s3_key1)
+    metadata = {'splice-time': splice['splice_time'], 'historical-end': splice['historical_end']}
+    # ISO 8601 timestamps, keeping the UTC offset of zone-aware series
+    csv_body = merged.assign(time=[t.isoformat() for t in merged['time']]).to_csv(index=False).encode()
+    s3_client.put_object(Bucket=bucket, Key=target, Body=csv_body, Metadata=metadata)
+    s3_client.put_object(Bucket=bucket, Key=columnar_key(target), Body=to_parquet_bytes(merged), Metadata=metadata)
+    splice['rows'] = int(len(merged))
+    return target, splice
+
+
+def consolidate_all(s3_client, bucket):
+    """Consolidate every bound series in the catalogue and write the splice manifest."""
+    manifest = {'generated_at': datetime.now(timezone.utc).isoformat(), 'series': {}}
+    bound = [dataset_type for dataset_type in DATASETS if is_bound(dataset_type)]
+    for dataset_type, aoi_type, coordinate in iter_series(bound):
+        s3_key1, s3_key2 = series_keys(dataset_type, aoi_type, coordinate)
+        try:
+            target, splice = consolidate_series(s3_client, bucket, s3_key1, s3_key2, schema_for(dataset_type))
+            manifest['series'][target] = splice
+        except Exception as e:
+            print(f"Error consolidating {s3_key1}: {e}")
+
+    s3_client.put_object(Bucket=bucket, Key=MANIFEST_KEY, Body=json.dumps(manifest, indent=1).encode())
+    return manifest
+
+
+if __name__ == '__main__':
+    from s3_fetch import s3_client, S3_BUCKET
+
+    manifest = consolidate_all(s3_client, S3_BUCKET)
+    print(f"Consolidated {len(manifest['series'])} series; splice points in {MANIFEST_KEY}")
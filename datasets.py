@@ -0,0 +1,461 @@
+"""Registry of every dataset shown by the dashboard.
+
+Each entry declares the page route, map id, S3 key templates (a single object per
+AOI, or a current/historical pair to bind), number of points, variables with units,
+and the WMTS/WMS overlay layers. Fetching, routing, page layouts and batch jobs are
+all driven from this table.
+
+An entry may also set `time_format`, the strftime pattern its CSVs write the `time`
+column in, when that is not ISO 8601.
+"""
+
+DATA_LAKE = 'csiem-data/data-lake'
+POLYGON_COUNT = 6
+# Timestamps in the data lake are ISO 8601 dates or date-times unless an entry says otherwise
+DEFAULT_TIME_FORMAT = 'ISO8601'
+
+
+def _var(value, name, units=None):
+    return {'value': value, 'name': name, 'units': units}
+
+
+def _wmts(name, layer, style):
+    """Copernicus Marine WMTS overlay."""
+    return {'kind': 'wmts', 'name': name, 'layer': layer, 'style': style, 'attribution': 'Copernicus Marine Service'}
+
+
+def _wms(name, url, layers):
+    """ERDDAP WMS overlay."""
+    return {'kind': 'wms', 'name': name, 'url': url, 'layers': layers, 'attribution': 'NOAA PolarWatch'}
+
+
+_GLOBCOLOUR_L3 = 'OCEANCOLOUR_GLO_BGC_L3_MY_009_103'
+_PISCES = 'GLOBAL_ANALYSISFORECAST_BGC_001_028'
+_PLANKTON = ['CHL', 'DIATO', 'DINO', 'GREEN', 'HAPTO', 'MICRO', 'NANO', 'PICO', 'PROCHLO', 'PROKAR']
+_REFLECTANCE = ['RRS412', 'RRS443', 'RRS490', 'RRS555', 'RRS670']
+
+DATASETS = {
+    'olci': {
+        'title': 'Sentinel Chlorophyll-a',
+        'path': '/esa/sentinel/olci',
+        'map_id': 'olci-map',
+        'info': 'olci',
+        'points': 32,
+        'keys': {
+            'point': f'{DATA_LAKE}/ESA/Sentinel/Points/CMEMS_OLCI_CHL_point_{{coordinate}}.csv',
+            'polygon': f'{DATA_LAKE}/ESA/Sentinel/Polygon_offshore/CMEMS_OLCI_CHL_polygon_{{coordinate}}.csv',
+        },
+        'variables': [_var('CHL', 'Chlorophyll-a', 'mg/m³')],
+        'layers': [
+            _wmts('Chlorophyll-a', f'{_GLOBCOLOUR_L3}/cmems_obs-oc_glo_bgc-plankton_my_l3-olci-4km_P1D_202207/CHL', 'cmap:jet,logScale'),
+        ],
+    },
+    'mur': {
+        'title': 'GHRSST SST',
+        'path': '/nasa/ghrsst/mur',
+        'map_id': 'mur-map',
+        'info': 'mur',
+        'points': 32,
+        'bind': {
+            'point': (
+                f'{DATA_LAKE}/NASA/GHRSST/Points/ghrsst_sst_point_{{coordinate}}.csv',
+                f'{DATA_LAKE}/NASA/GHRSST/Points/2002-2023/GHRSST_sst_point_{{coordinate}}.csv',
+            ),
+            'polygon': (
+                f'{DATA_LAKE}/NASA/GHRSST/Polygon_offshore/ghrsst_sst_polygon_{{coordinate}}.csv',
+                f'{DATA_LAKE}/NASA/GHRSST/Polygon_offshore/2002-2023/ghrsst_offshore_sst_polygon_{{coordinate}}.csv',
+            ),
+        },
+        'variables': [_var('analysed_sst', 'Sea Surface Temperature', '°C')],
+        'layers': [
+            _wms('GHRSST SST', 'https://polarwatch.noaa.gov/erddap/wms/jplMURSST41/request', 'jplMURSST41:analysed_sst'),
+        ],
+    },
+    'reflectance': {
+        'title': 'GlobColour Reflectance',
+        'path': '/esa/globcolor/reflectance',
+        'map_id': 'reflectance-map',
+        'info': 'reflectance',
+        'points': 13,
+        'keys': {
+            'point': f'{DATA_LAKE}/ESA/GlobColor/Reflectance/Point/CMEMS_reflectance_point_{{coordinate}}.csv',
+            'polygon': f'{DATA_LAKE}/ESA/GlobColor/Reflectance/Polygon/CMEMS_reflectance_polygon_{{coordinate}}.csv',
+        },
+        'variables': [_var(band, f'RS reflectance at {band[3:]}nm', 'sr⁻¹') for band in _REFLECTANCE],
+        'layers': [
+            _wmts(band, f'{_GLOBCOLOUR_L3}/cmems_obs-oc_glo_bgc-reflectance_my_l3-multi-4km_P1D_202311/{band}', 'cmap:jet')
+            for band in _REFLECTANCE
+        ],
+    },
+    'plankton': {
+        'title': 'GlobColour Plankton',
+        'path': '/esa/globcolor/plankton',
+        'map_id': 'plankton-map',
+        'info': 'plankton',
+        'points': 13,
+        'keys': {
+            'point': f'{DATA_LAKE}/ESA/GlobColor/Plankton/Points/CMEMS_planktons_point_{{coordinate}}.csv',
+            'polygon': f'{DATA_LAKE}/ESA/GlobColor/Plankton/Polygon/CMEMS_planktons_polygon_{{coordinate}}.csv',
+        },
+        'variables': [
+            _var('CHL', 'Chlorophyll-a', 'mg m⁻³'),
+            _var('DIATO', 'Diatoms', 'mg m⁻³'),
+            _var('DINO', 'Dinoflagellates', 'mg m⁻³'),
+            _var('GREEN', 'Green Algae', 'mg m⁻³'),
+            _var('HAPTO', 'Haptophytes', 'mg m⁻³'),
+            _var('MICRO', 'Microplankton', 'mg m⁻³'),
+            _var('NANO', 'Nanoplankton', 'mg m⁻³'),
+            _var('PICO', 'Picoplankton', 'mg m⁻³'),
+            _var('PROCHLO', 'Prochlorococcus', 'mg m⁻³'),
+            _var('PROKAR', 'Prokaryotes', 'mg m⁻³'),
+        ],
+        'layers': [
+            _wmts(variable, f'{_GLOBCOLOUR_L3}/cmems_obs-oc_glo_bgc-plankton_my_l3-multi-4km_P1D_202311/{variable}', 'cmap:algae')
+            for variable in _PLANKTON
+        ],
+    },
+    'transp': {
+        'title': 'GlobColour Transparency',
+        'path': '/esa/globcolor/transp',
+        'map_id': 'transp-map',
+        'info': 'transp',
+        'points': 13,
+        'keys': {
+            'point': f'{DATA_LAKE}/ESA/GlobColor/Transp/Point/CMEMS_transp_point_{{coordinate}}.csv',
+            'polygon': f'{DATA_LAKE}/ESA/GlobColor/Transp/Polygon/CMEMS_transp_polygon_{{coordinate}}.csv',
+        },
+        'variables': [
+            _var('KD490', 'diffuse attenuation coefficient at 490 nm', 'm⁻¹'),
+            _var('ZSD', 'Secchi disk depth', 'm'),
+            _var('SPM', 'Suspended particulate matter', 'g/m³'),
+        ],
+        'layers': [
+            _wmts(variable, f'{_GLOBCOLOUR_L3}/cmems_obs-oc_glo_bgc-transp_my_l3-multi-4km_P1D_202311/{variable}', f'cmap:{cmap}')
+            for variable, cmap in zip(['KD490', 'SPM', 'ZSD'], ['dense', 'dense', 'viridis'])
+        ],
+    },
+    'optics': {
+        'title': 'GlobColour Optics',
+        'path': '/esa/globcolor/optics',
+        'map_id': 'optics-map',
+        'info': 'optics',
+        'points': 13,
+        'keys': {
+            'point': f'{DATA_LAKE}/ESA/GlobColor/Optics/Point/CMEMS_optics_point_{{coordinate}}.csv',
+            'polygon': f'{DATA_LAKE}/ESA/GlobColor/Optics/Polygon/CMEMS_optics_polygon_{{coordinate}}.csv',
+        },
+        'variables': [
+            _var('BBP', 'Backscattering coefficient', 'm⁻¹'),
+            _var('CDM', 'Colored Dissolved Organic Matter', 'm⁻¹'),
+        ],
+        'layers': [
+            _wmts(variable, f'{_GLOBCOLOUR_L3}/cmems_obs-oc_glo_bgc-optics_my_l3-multi-4km_P1D_202311/{variable}', f'cmap:{cmap}')
+            for variable, cmap in zip(['BBP', 'CDM'], ['solar', 'dense'])
+        ],
+    },
+    'pp': {
+        'title': 'GlobColour Primary Productivity',
+        'path': '/esa/globcolor/pp',
+        'map_id': 'pp-map',
+        'info': 'pp',
+        'points': 13,
+        'keys': {
+            'point': f'{DATA_LAKE}/ESA/GlobColor/PP/Point/CMEMS_PP_point_{{coordinate}}.csv',
+            'polygon': f'{DATA_LAKE}/ESA/GlobColor/PP/Polygon/CMEMS_PP_polygon_{{coordinate}}.csv',
+        },
+        'variables': [_var('PP', 'Primary Production', 'mg C m⁻² day⁻¹')],
+        'layers': [
+            _wmts('Primary Production', 'OCEANCOLOUR_GLO_BGC_L4_NRT_009_102/cmems_obs-oc_glo_bgc-pp_nrt_l4-multi-4km_P1M_202311/PP', 'cmap:matter'),
+        ],
+    },
+    'ostia': {
+        'title': 'UKMO SST',
+        'path': '/ukmo/ostia',
+        'map_id': 'ostia-map',
+        'info': 'ostia',
+        'points': 13,
+        'bind': {
+            'point': (
+                f'{DATA_LAKE}/UKMO/OSTIA/Temperature/Points/CMEMS_SST_point_{{coordinate}}.csv',
+                f'{DATA_LAKE}/UKMO/OSTIA/Temperature/Points/1981-2006/SST_19811001_20061231_point_{{coordinate}}.csv',
+            ),
+            'polygon': (
+                f'{DATA_LAKE}/UKMO/OSTIA/Temperature/Polygon/CMEMS_SST_polygon_{{coordinate}}.csv',
+                f'{DATA_LAKE}/UKMO/OSTIA/Temperature/Polygon/1981-2006/CMEMS_SST_polygon_{{coordinate}}.csv',
+            ),
+        },
+        'variables': [_var('analysed_sst', 'Sea Surface Temperature', '°K')],
+        'layers': [
+            _wmts('UKMO SST', 'SST_GLO_SST_L4_NRT_OBSERVATIONS_010_001/METOFFICE-GLO-SST-L4-NRT-OBS-SST-V2/analysed_sst', 'cmap:jet'),
+        ],
+    },
+    'poc': {
+        'title': 'MODIS POC',
+        'path': '/nasa/modis/poc',
+        'map_id': 'poc-map',
+        'info': 'poc',
+        'points': 13,
+        'bind': {
+            'point': (
+                f'{DATA_LAKE}/NASA/MODIS/POC/Points/MODIS_POC_point_{{coordinate}}.csv',
+                f'{DATA_LAKE}/NASA/MODIS/POC/Points/2003-2022/Aq-MODIS_POC_point_{{coordinate}}.csv',
+            ),
+            'polygon': (
+                f'{DATA_LAKE}/NASA/MODIS/POC/Polygon/MODIS_POC_polygon_{{coordinate}}.csv',
+                f'{DATA_LAKE}/NASA/MODIS/POC/Polygon/2003-2022/MODIS_POC_polygon_{{coordinate}}.csv',
+            ),
+        },
+        'variables': [_var('poc', 'Particulate Organic Carbon', 'mg m⁻³')],
+        'layers': [
+            _wms('MODIS POC', 'https://coastwatch.pfeg.noaa.gov/erddap/wms/erdMPOCmday_R2022NRT/request', 'erdMPOCmday_R2022NRT:poc'),
+        ],
+    },
+    'par': {
+        'title': 'MODIS PAR',
+        'path': '/nasa/modis/par',
+        'map_id': 'par-map',
+        'info': 'par',
+        'points': 13,
+        'bind': {
+            'point': (
+                f'{DATA_LAKE}/NASA/MODIS/PAR/Points/MODIS_PAR_point_{{coordinate}}.csv',
+                f'{DATA_LAKE}/NASA/MODIS/PAR/Points/2003-2022/Aq-MODIS_PAR_point_{{coordinate}}.csv',
+            ),
+            'polygon': (
+                f'{DATA_LAKE}/NASA/MODIS/PAR/Polygon/MODIS_PAR_polygon_{{coordinate}}.csv',
+                f'{DATA_LAKE}/NASA/MODIS/PAR/Polygon/2003-2022/MODIS_PAR_polygon_{{coordinate}}.csv',
+            ),
+        },
+        'variables': [_var('par', 'Photosynthetically Available Radiation', 'Einstein m⁻² d⁻¹')],
+        'layers': [
+            _wms('MODIS PAR', 'https://coastwatch.pfeg.noaa.gov/erddap/wms/erdMH1par0mday_R2022NRT/request', 'erdMH1par0mday_R2022NRT:par'),
+        ],
+    },
+    'pic': {
+        'title': 'MODIS PIC',
+        'path': '/nasa/modis/pic',
+        'map_id': 'pic-map',
+        'info': 'pic',
+        'points': 13,
+        'bind': {
+            'point': (
+                f'{DATA_LAKE}/NASA/MODIS/PIC/Points/MODIS_PIC_point_{{coordinate}}.csv',
+                f'{DATA_LAKE}/NASA/MODIS/PIC/Points/2003-2022/Aq-MODIS_PIC_point_{{coordinate}}.csv',
+            ),
+            'polygon': (
+                f'{DATA_LAKE}/NASA/MODIS/PIC/Polygon/MODIS_PIC_polygon_{{coordinate}}.csv',
+                f'{DATA_LAKE}/NASA/MODIS/PIC/Polygon/2003-2022/MODIS_PIC_polygon_{{coordinate}}.csv',
+            ),
+        },
+        'variables': [_var('pic', 'Particulate Inorganic Carbon', 'mg m⁻³')],
+        'layers': [
+            _wms('MODIS PIC', 'https://coastwatch.pfeg.noaa.gov/erddap/wms/erdMPICmday_R2022NRT/request', 'erdMPICmday_R2022NRT:pic'),
+        ],
+    },
+    'mod_bio': {
+        'title': 'Model Biogeochemistry',
+        'path': '/moi/model/pisces/bio',
+        'map_id': 'mod-bio-map',
+        'info': 'model_bio',
+        'points': 13,
+        'keys': {
+            'point': f'{DATA_LAKE}/MOI/PISCES/Model_bio/Points/CMEMS_bio_point_{{coordinate}}.csv',
+            'polygon': f'{DATA_LAKE}/MOI/PISCES/Model_bio/Polygon/CMEMS_bio_polygon_{{coordinate}}.csv',
+        },
+        'variables': [
+            _var('nppv', 'Total Primary Production of Phyto', 'mg m⁻³ d⁻¹'),
+            _var('o2', 'Dissolved Oxygen', 'mmol m⁻³'),
+        ],
+        'layers': [
+            _wmts(variable, f'{_PISCES}/cmems_mod_glo_bgc-bio_anfc_0.25deg_P1D-m_202311/{variable}', 'cmap:matter')
+            for variable in ['nppv', 'o2']
+        ],
+    },
+    'mod_nut': {
+        'title': 'Model Nutrients',
+        'path': '/moi/model/pisces/nut',
+        'map_id': 'mod-nut-map',
+        'info': 'model_nut',
+        'points': 13,
+        'keys': {
+            'point': f'{DATA_LAKE}/MOI/PISCES/Model_Nut/Points/CMEMS_nut_point_{{coordinate}}.csv',
+            'polygon': f'{DATA_LAKE}/MOI/PISCES/Model_Nut/Polygon/CMEMS_nut_polygon_{{coordinate}}.csv',
+        },
+        'variables': [
+            _var('no3', 'Nitrate', 'mmol m⁻³'),
+            _var('po4', 'Phosphate', 'mmol m⁻³'),
+            _var('si', 'Dissolved Silicate', 'mmol m⁻³'),
+            _var('fe', 'Dissolved Iron', 'mmol m⁻³'),
+        ],
+        'layers': [
+            _wmts(variable, f'{_PISCES}/cmems_mod_glo_bgc-nut_anfc_0.25deg_P1D-m_202311/{variable}', f'cmap:{cmap}')
+            for variable, cmap in zip(['no3', 'po4', 'si', 'fe'], ['matter', 'dense', 'dense', 'dense'])
+        ],
+    },
+    'mod_optics': {
+        'title': 'Model Optics',
+        'path': '/moi/model/pisces/optics',
+        'map_id': 'mod-optics-map',
+        'info': 'model_optics',
+        'points': 13,
+        'keys': {
+            'point': f'{DATA_LAKE}/MOI/PISCES/Model_optics/Points/CMEMS_optics_point_{{coordinate}}.csv',
+            'polygon': f'{DATA_LAKE}/MOI/PISCES/Model_optics/Polygon/CMEMS_optics_polygon_{{coordinate}}.csv',
+        },
+        'variables': [_var('kd', 'Volume attenuation coefficient', 'm⁻¹')],
+        'layers': [
+            _wmts('kd', f'{_PISCES}/cmems_mod_glo_bgc-optics_anfc_0.25deg_P1D-m_202311/kd', 'cmap:viridis'),
+        ],
+    },
+    'mod_car': {
+        'title': 'Model Carbonate',
+        'path': '/moi/model/pisces/car',
+        'map_id': 'mod-car-map',
+        'info': 'model_car',
+        'points': 13,
+        'keys': {
+            'point': f'{DATA_LAKE}/MOI/PISCES/Model_car/Points/CMEMS_car_point_{{coordinate}}.csv',
+            'polygon': f'{DATA_LAKE}/MOI/PISCES/Model_car/Polygon/CMEMS_car_polygon_{{coordinate}}.csv',
+        },
+        'variables': [
+            _var('talk', 'Total Alkalinity', 'mol m⁻³'),
+            _var('dissic', 'Dissolved Inorganic Carbon', 'mol m⁻³'),
+            _var('ph', 'pH'),
+        ],
+        'layers': [
+            _wmts(variable, f'{_PISCES}/cmems_mod_glo_bgc-car_anfc_0.25deg_P1D-m_202311/{variable}', f'cmap:{cmap}')
+            for variable, cmap in zip(['talk', 'dissic', 'ph'], ['matter', 'dense', 'viridis'])
+        ],
+    },
+    'mod_co2': {
+        'title': 'Model CO₂',
+        'path': '/moi/model/pisces/co2',
+        'map_id': 'mod-co2-map',
+        'info': 'model_co2',
+        'points': 13,
+        'keys': {
+            'point': f'{DATA_LAKE}/MOI/PISCES/Model_co2/Points/CMEMS_co2_point_{{coordinate}}.csv',
+            'polygon': f'{DATA_LAKE}/MOI/PISCES/Model_co2/Polygon/CMEMS_co2_polygon_{{coordinate}}.csv',
+        },
+        'variables': [_var('spco2', 'Surface partial pressure of CO₂', 'Pa')],
+        'layers': [
+            _wmts('spco2', f'{_PISCES}/cmems_mod_glo_bgc-co2_anfc_0.25deg_P1D-m_202311/spco2', 'cmap:matter'),
+        ],
+    },
+    'mod_pfts': {
+        'title': 'Model PFTs',
+        'path': '/moi/model/pisces/pfts',
+        'map_id': 'mod-pfts-map',
+        'info': 'model_pfts',
+        'points': 13,
+        'keys': {
+            'point': f'{DATA_LAKE}/MOI/PISCES/Model_pft/Points/CMEMS_pft_point_{{coordinate}}.csv',
+            'polygon': f'{DATA_LAKE}/MOI/PISCES/Model_pft/Polygon/CMEMS_pft_polygon_{{coordinate}}.csv',
+        },
+        'variables': [
+            _var('chl', 'chlorophyll-a', 'mg m⁻³'),
+            _var('phyc', 'Phytoplankton', 'mmol m⁻³'),
+        ],
+        'layers': [
+            _wmts(variable, f'{_PISCES}/cmems_mod_glo_bgc-pft_anfc_0.25deg_P1D-m_202311/{variable}', f'cmap:{cmap}')
+            for variable, cmap in zip(['chl', 'phyc'], ['algae', 'matter'])
+        ],
+    },
+    'mod_biomass': {
+        'title': 'Model Biomass',
+        'path': '/moi/model/seapodym/biomass',
+        'map_id': 'mod-biomass-map',
+        'info': 'model_biomass',
+        'points': 13,
+        'keys': {
+            'point': f'{DATA_LAKE}/MOI/SEAPODYM/Model_PP_ZO/Points/CMEMS_npp_zooc_point_{{coordinate}}.csv',
+            'polygon': f'{DATA_LAKE}/MOI/SEAPODYM/Model_PP_ZO/Polygon/CMEMS_npp_zooc_polygon_{{coordinate}}.csv',
+        },
+        'variables': [
+            _var('zooc', 'Zooplankton', 'g m²'),
+            _var('npp', 'Net primary productivity', 'mg m⁻² day⁻¹'),
+        ],
+        'layers': [
+            _wmts(variable, f'GLOBAL_MULTIYEAR_BGC_001_033/cmems_mod_glo_bgc_my_0.083deg-lmtl_PT1D-i_202211/{variable}', f'cmap:{cmap}')
+            for variable, cmap in zip(['zooc', 'npp'], ['matter', 'algae'])
+        ],
+    },
+    'mod_sal': {
+        'title': 'Model Salinity',
+        'path': '/moi/model/nemo/salinity',
+        'map_id': 'mod-sal-map',
+        'info': 'model_sal',
+        'points': 13,
+        'keys': {
+            'point': f'{DATA_LAKE}/MOI/NEMO/Model_salinity/Points/CMEMS_Salt_point_{{coordinate}}.csv',
+            'polygon': f'{DATA_LAKE}/MOI/NEMO/Model_salinity/Polygon/CMEMS_Salt_polygon_{{coordinate}}.csv',
+        },
+        'variables': [_var('so', 'Salinity', 'PSU')],
+        'layers': [
+            _wmts('Salinity', 'GLOBAL_ANALYSISFORECAST_PHY_001_024/cmems_mod_glo_phy-so_anfc_0.083deg_P1D-m_202406/so', 'cmap:haline'),
+        ],
+    },
+}
+
+# Page route -> dataset type
+ROUTES = {dataset['path']: dataset_type for dataset_type, dataset in DATASETS.items()}
+
+
+def get_dataset(dataset_type):
+    return DATASETS.get(dataset_type)
+
+
+def dataset_for_path(pathname):
+    return ROUTES.get(pathname)
+
+
+def point_count(dataset_type):
+    dataset = DATASETS.get(dataset_type)
+    return dataset['points'] if dataset else 0
+
+
+def variable_label(dataset_type, variable):
+    """Axis/dropdown label of a variable, e.g. 'Salinity [PSU]'."""
+    dataset = DATASETS.get(dataset_type) or {}
+    for entry in dataset.get('variables', []):
+        if entry['value'] == variable:
+            return f"{entry['name']} [{entry['units']}]" if entry['units'] else entry['name']
+    return variable.capitalize() if variable else ''
+
+
+def variable_options(dataset_type):
+    return [
+        {'label': variable_label(dataset_type, entry['value']), 'value': entry['value']}
+        for entry in DATASETS[dataset_type]['variables']
+    ]
+
+
+def time_format(dataset_type):
+    """Format of the `time` column in a dataset's CSVs, for pd.to_datetime."""
+    return DATASETS.get(dataset_type, {}).get('time_format', DEFAULT_TIME_FORMAT)
+
+
+def series_keys(dataset_type, aoi_type, coordinate):
+    """Return the S3 keys of one series: a 1-tuple, or (current, historical) for bound datasets."""
+    dataset = DATASETS.get(dataset_type)
+    if dataset is None or coordinate is None:
+        return None
+    templates = dataset.get('bind', {}).get(aoi_type) or dataset.get('keys', {}).get(aoi_type)
+    if templates is None:
+        return None
+    if isinstance(templates, str):
+        templates = (templates,)
+    return tuple(template.format(coordinate=coordinate) for template in templates)
+
+
+def is_bound(dataset_type):
+    return 'bind' in DATASETS.get(dataset_type, {})
+
+
+def iter_series(dataset_types=None):
+    """Yield (dataset_type, aoi_type, coordinate) for every series in the catalogue."""
+    for dataset_type in dataset_types or DATASETS:
+        for i in range(1, DATASETS[dataset_type]['points'] + 1):
+            yield dataset_type, 'point', str(i)
+        for i in range(1, POLYGON_COUNT + 1):
+            yield dataset_type, 'polygon', str(i)
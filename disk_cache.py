@@ -0,0 +1,154 @@
+import os
+import gzip
+import json
+import time
+import hashlib
+import threading
+
+# Eviction removes the least recently used objects until the cache is back under this share of its cap
+LOW_WATER = 0.9
+
+
+class DiskCache:
+    """Size-capped on-disk store of raw S3 objects, gzip-compressed, kept alongside their ETag.
+
+    With `compress=False` bodies are stored as they are, for content that is already
+    compressed (e.g. PNG tiles).
+    """
+
+    def __init__(self, directory, max_bytes, compress=True):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.compress = compress
+        self._suffix = '.gz' if compress else '.bin'
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+        # Running total of the stored bytes: scanned once here, then kept up to date by put/invalidate
+        self._total = self.size()
+
+    def get(self, key):
+        """Return (body, meta) for `key`, or None when there is no usable local copy."""
+        data_path, meta_path = self._paths(key)
+        try:
+            with open(meta_path) as f:
+                meta = json.load(f)
+            with (gzip.open if self.compress else open)(data_path, 'rb') as f:
+                body = f.read()
+        except (OSError, ValueError, EOFError):
+            return None
+        # Bump the modification time so eviction sees this entry as recently used
+        self._touch_file(data_path)
+        return body, meta
+
+    def meta(self, key):
+        """Return the stored validators and size of `key` without reading its body, or None."""
+        try:
+            with open(self._paths(key)[1]) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def put(self, key, body, etag=None, last_modified=None):
+        """Store an object body with its validators, then evict old entries if over the cap."""
+        data_path, meta_path = self._paths(key)
+        meta = {
+            'key': key,
+            'etag': etag,
+            'last_modified': last_modified,
+            'size': len(body),
+            'validated_at': time.time(),
+        }
+        data = gzip.compress(body, compresslevel=6) if self.compress else body
+        replaced = self._file_size(data_path)
+        self._write_atomic(data_path, data)
+        self._write_atomic(meta_path, json.dumps(meta).encode())
+        with self._lock:
+            self._total += len(data) - replaced
+            over = self._total > self.max_bytes
+        if over:
+            self._evict()
+        return meta
+
+    def touch(self, key):
+        """Record a successful revalidation (e.g. a 304) for `key`."""
+        data_path, meta_path = self._paths(key)
+        try:
+            with open(meta_path) as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return
+        meta['validated_at'] = time.time()
+        self._write_atomic(meta_path, json.dumps(meta).encode())
+        self._touch_file(data_path)
+
+    def invalidate(self, key):
+        data_path, meta_path = self._paths(key)
+        removed = self._file_size(data_path)
+        for path in (data_path, meta_path):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+        with self._lock:
+            self._total = max(0, self._total - removed)
+
+    def size(self):
+        return sum(size for _, size, _ in self._data_files())
+
+    def _paths(self, key):
+        digest = hashlib.sha1(key.encode()).hexdigest()
+        base = os.path.join(self.directory, digest)
+        return base + self._suffix, base + '.json'
+
+    def _data_files(self):
+        files = []
+        for name in os.listdir(self.directory):
+            if not name.endswith(self._suffix):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            files.append((path, st.st_size, st.st_mtime))
+        return files
+
+    def _evict(self):
+        with self._lock:
+            # Rescan, which also picks up what other processes sharing the directory wrote or removed
+            files = self._data_files()
+            total = sum(size for _, size, _ in files)
+            if total > self.max_bytes:
+                # Drop least recently used objects first, a batch at a time so the next puts do not scan again
+                for path, size, _ in sorted(files, key=lambda f: f[2]):
+                    for stale in (path, path[:-len(self._suffix)] + '.json'):
+                        try:
+                            os.remove(stale)
+                        except OSError:
+                            pass
+                    total -= size
+                    if total <= self.max_bytes * LOW_WATER:
+                        break
+            self._total = total
+
+    @staticmethod
+    def _file_size(path):
+        try:
+            return os.stat(path).st_size
+        except OSError:
+            return 0
+
+    @staticmethod
+    def _touch_file(path):
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+
+    @staticmethod
+    def _write_atomic(path, data):
+        # Write to a temporary file and rename so concurrent readers never see a partial file
+        tmp_path = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
@@ -0,0 +1,79 @@
+import numpy as np
+import pandas as pd
+
+# Plot width assumed until the browser has reported the real one
+DEFAULT_PLOT_WIDTH = 1200
+# Points drawn per horizontal pixel; two keeps the line visually identical to the full series
+POINTS_PER_PIXEL = 2
+
+
+# Widths are rounded up to this step so nearby plot sizes share one point budget (and memoized result)
+WIDTH_STEP = 100
+
+
+def target_points(plot_width):
+    width = int(plot_width or DEFAULT_PLOT_WIDTH)
+    return POINTS_PER_PIXEL * -(-width // WIDTH_STEP) * WIDTH_STEP
+
+
+def lttb(x, y, threshold):
+    """Largest-triangle-three-buckets: indices of `threshold` points that keep the shape (and peaks) of y(x)."""
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    every = (n - 2) / (threshold - 2)
+    selected = np.empty(threshold, dtype=np.int64)
+    selected[0] = 0
+    a = 0
+    for i in range(threshold - 2):
+        start = int(i * every) + 1
+        end = int((i + 1) * every) + 1
+        next_end = min(int((i + 2) * every) + 1, n)
+        # Average of the next bucket (the last point once the buckets run out)
+        if end >= next_end:
+            avg_x, avg_y = x[n - 1], y[n - 1]
+        else:
+            avg_x, avg_y = x[end:next_end].mean(), y[end:next_end].mean()
+        # Keep the point forming the largest triangle with the previous pick and that average
+        areas = np.abs((x[a] - avg_x) * (y[start:end] - y[a]) - (x[a] - x[start:end]) * (avg_y - y[a]))
+        a = start + int(areas.argmax())
+        selected[i + 1] = a
+    selected[-1] = n - 1
+    return selected
+
+
+def downsample_series(df, column, max_points):
+    """Reduce a time series to about `max_points` rows with LTTB.
+
+    Only valid samples take part in the selection; wherever missing values fall between
+    two selected samples one missing row is kept, so the plotted line still breaks there.
+    """
+    df = df[['time', column]]
+    y = df[column].to_numpy(dtype='float64')
+    valid = ~np.isnan(y)
+    if int(valid.sum()) <= max_points:
+        return df
+
+    # Seconds since the first sample keeps the triangle areas well conditioned
+    t = df['time'].to_numpy(dtype='datetime64[ns]').astype('int64')
+    x = (t - t[0]) / 1e9
+
+    valid_rows = np.flatnonzero(valid)
+    picked = valid_rows[lttb(x[valid_rows], y[valid_rows], max_points)]
+
+    missing_rows = np.flatnonzero(~valid)
+    if len(missing_rows):
+        missing_before = np.cumsum(~valid)
+        gaps = np.flatnonzero(missing_before[picked[1:]] != missing_before[picked[:-1]])
+        breaks = missing_rows[np.searchsorted(missing_rows, picked[gaps])]
+        picked = np.sort(np.concatenate([picked, breaks]))
+    return df.iloc[picked].reset_index(drop=True)
+
+
+def slice_window(df, start=None, end=None):
+    """Rows of a time-sorted series within [start, end], plus one neighbour each side so the line reaches the edges."""
+    times = df['time'].to_numpy()
+    first = np.searchsorted(times, np.datetime64(pd.Timestamp(start)), side='left') if start is not None else 0
+    last = np.searchsorted(times, np.datetime64(pd.Timestamp(end)), side='right') if end is not None else len(times)
+    return df.iloc[max(first - 1, 0):min(last + 1, len(times))]
@@ -0,0 +1,49 @@
+import os
+import fcntl
+import multiprocessing
+
+# Serve the Flask server behind the Dash app
+wsgi_app = 'wsgi:server'
+bind = f"0.0.0.0:{os.getenv('PORT', '8050')}"
+
+# Pre-forked workers, each with a thread pool for concurrent callbacks
+workers = int(os.getenv('GUNICORN_WORKERS', multiprocessing.cpu_count() * 2 + 1))
+threads = int(os.getenv('GUNICORN_THREADS', 4))
+worker_class = 'gthread'
+timeout = int(os.getenv('GUNICORN_TIMEOUT', 120))
+graceful_timeout = int(os.getenv('GUNICORN_GRACEFUL_TIMEOUT', 30))
+keepalive = int(os.getenv('GUNICORN_KEEPALIVE', 5))
+
+# Import the app (shapefiles, registry, S3 client) once in the master, before forking
+preload_app = os.getenv('GUNICORN_PRELOAD', '1') == '1'
+
+accesslog = '-'
+errorlog = '-'
+loglevel = os.getenv('GUNICORN_LOG_LEVEL', 'info')
+
+# Held for the life of the worker that runs the background jobs of this host
+BACKGROUND_LOCK = os.getenv('BACKGROUND_LOCK', os.path.join('.cache', 'background.lock'))
+_background_lock = None
+
+
+def on_starting(server):
+    """Drop the warm-up progress of a previous run, so no worker reports ready before this one warms up."""
+    from warmup import warmup
+    warmup.reset()
+
+
+def post_fork(server, worker):
+    """Start the background jobs in exactly one worker; if it dies, the next worker forked takes over."""
+    global _background_lock
+    os.makedirs(os.path.dirname(BACKGROUND_LOCK) or '.', exist_ok=True)
+    lock = open(BACKGROUND_LOCK, 'w')
+    try:
+        fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        lock.close()
+        return
+    _background_lock = lock
+    server.log.info(f"Worker {worker.pid} runs the background jobs")
+
+    from app import start_background_tasks
+    start_background_tasks()
@@ -0,0 +1,224 @@
+import os
+import json
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+from plotly.io.json import to_json_plotly
+
+try:
+    import redis
+except ImportError:
+    redis = None
+
+# Faster decoding of stored results when orjson is installed
+try:
+    from orjson import loads as _loads
+except ImportError:
+    _loads = json.loads
+
+
+class MemoryBackend:
+    """Per-process store with expiry, dropping the least recently used entries beyond `max_entries` or `max_bytes`."""
+
+    def __init__(self, max_entries, max_bytes):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires = entry
+            if expires < time.time():
+                self._remove(key)
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl):
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            # A single result larger than the whole budget is never stored
+            if len(value) > self.max_bytes:
+                return
+            self._entries[key] = (value, time.time() + ttl)
+            self.current_bytes += len(value)
+            while len(self._entries) > self.max_entries or self.current_bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+
+    def _remove(self, key):
+        value, _ = self._entries.pop(key)
+        self.current_bytes -= len(value)
+
+
+class DiskBackend:
+    """One file per result, shared by every process on the host; a file expires `ttl` seconds after it was written.
+
+    Beyond `max_bytes` the least recently read files are removed first.
+    """
+
+    def __init__(self, directory, max_bytes):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def get(self, key):
+        path = os.path.join(self.directory, key)
+        try:
+            with open(path, 'rb') as f:
+                expires = float(f.readline())
+                if expires < time.time():
+                    os.remove(path)
+                    return None
+                value = f.read()
+            # Bump the modification time so eviction sees this entry as recently used
+            os.utime(path)
+            return value
+        except (OSError, ValueError):
+            return None
+
+    def set(self, key, value, ttl):
+        path = os.path.join(self.directory, key)
+        tmp_path = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+        try:
+            with open(tmp_path, 'wb') as f:
+                f.write(f'{time.time() + ttl}\n'.encode())
+                f.write(value)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"Error writing memo entry {key}: {e}")
+            return
+        self._evict()
+
+    def clear(self):
+        for name in os.listdir(self.directory):
+            try:
+                os.remove(os.path.join(self.directory, name))
+            except OSError:
+                pass
+
+    def _evict(self):
+        with self._lock:
+            files = []
+            for name in os.listdir(self.directory):
+                if name.endswith('.tmp'):
+                    continue
+                path = os.path.join(self.directory, name)
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                files.append((path, st.st_size, st.st_mtime))
+            total = sum(size for _, size, _ in files)
+            # Drop least recently used results first
+            for path, size, _ in sorted(files, key=lambda f: f[2]):
+                if total <= self.max_bytes:
+                    break
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+                total -= size
+
+
+class RedisBackend:
+    """Results shared by every process and host through a Redis-compatible server; errors count as misses."""
+
+    def __init__(self, url, prefix='memo:'):
+        self.prefix = prefix
+        self.client = redis.Redis.from_url(url)
+
+    def get(self, key):
+        try:
+            return self.client.get(self.prefix + key)
+        except redis.RedisError as e:
+            print(f"Error reading memo entry {key}: {e}")
+            return None
+
+    def set(self, key, value, ttl):
+        try:
+            self.client.set(self.prefix + key, value, ex=max(1, int(ttl)))
+        except redis.RedisError as e:
+            print(f"Error writing memo entry {key}: {e}")
+
+    def clear(self):
+        try:
+            for key in self.client.scan_iter(match=self.prefix + '*'):
+                self.client.delete(key)
+        except redis.RedisError as e:
+            print(f"Error clearing memo entries: {e}")
+
+
+class Memo:
+    """Callback results stored under a hash of their normalized inputs and the version of the data behind them."""
+
+    def __init__(self, backend, ttl):
+        self.backend = backend
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(namespace, inputs, version=None):
+        normalized = json.dumps({'inputs': inputs, 'version': version}, sort_keys=True, default=str)
+        return f"{namespace}-{hashlib.sha1(normalized.encode()).hexdigest()}"
+
+    def cached(self, namespace, inputs, version, compute):
+        """Return the stored result for these inputs and data version, or compute and store it.
+
+        Stored results come back as plain JSON values (figures as dicts); None is never stored.
+        """
+        if self.backend is None or self.ttl <= 0:
+            return compute()
+        key = self.key(namespace, inputs, version)
+        stored = self.backend.get(key)
+        if stored is not None:
+            self.hits += 1
+            return _loads(stored)
+        self.misses += 1
+        value = compute()
+        if value is not None:
+            self.backend.set(key, to_json_plotly(value).encode(), self.ttl)
+        return value
+
+    def clear(self):
+        if self.backend is not None:
+            self.backend.clear()
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            'backend': type(self.backend).__name__ if self.backend is not None else None,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / total if total else 0.0,
+        }
+
+
+def create_backend(name):
+    if name == 'none':
+        return None
+    max_bytes = int(os.getenv('MEMO_MAX_BYTES', 256 * 1024 * 1024))
+    if name == 'disk':
+        return DiskBackend(os.getenv('MEMO_DIR', os.path.join('.cache', 'memo')), max_bytes)
+    if name == 'redis':
+        if redis is not None:
+            return RedisBackend(os.getenv('MEMO_REDIS_URL', 'redis://localhost:6379/0'))
+        # Without the redis package the per-process store stands in
+        print("redis is not installed; memoizing callback results in memory")
+    return MemoryBackend(int(os.getenv('MEMO_MAX_ENTRIES', 512)), max_bytes)
+
+
+memo = Memo(create_backend(os.getenv('MEMO_BACKEND', 'memory')), ttl=float(os.getenv('MEMO_TTL', 600)))
@@ -0,0 +1,60 @@
+import numpy as np
+import plotly.io as pio
+import plotly.graph_objects as go
+
+# orjson serializes numpy arrays natively and far faster, with float32 values in their short form
+try:
+    import orjson  # noqa: F401
+    pio.json.config.default_engine = 'orjson'
+except ImportError:
+    pass
+
+TEMPLATE = 'seaf'
+LINE_COLOR = '#636efa'
+BAND_COLOR = 'rgba(99, 110, 250, 0.2)'
+
+# Dashboard style for time-series plots, registered once instead of being reapplied to every figure
+pio.templates[TEMPLATE] = go.layout.Template(
+    layout=dict(
+        font=dict(family="Times New Roman", size=18, color="Black"),
+        title=dict(font=dict(size=24, color="#2c3e50"), x=0.5, xanchor='center', yanchor='top'),
+        xaxis=dict(showgrid=False, title=dict(text="Time"), ticks='', zeroline=False, automargin=True),
+        yaxis=dict(showgrid=True, gridcolor='#dddddd', ticks='', zeroline=False, automargin=True),
+        paper_bgcolor='white',
+        plot_bgcolor='#fafafa',
+        hovermode="x unified",
+        margin=dict(l=50, r=50, t=50, b=50),
+        colorway=[LINE_COLOR],
+    ),
+    data=dict(scattergl=[go.Scattergl(mode='lines', hovertemplate='%{x}: %{y:.2f}<extra></extra>')]),
+)
+
+
+def time_values(times):
+    """Timestamps as the shortest ISO strings that keep them exact (dates alone for daily data)."""
+    times = times.to_numpy(dtype='datetime64[ns]') if hasattr(times, 'to_numpy') else np.asarray(times, dtype='datetime64[ns]')
+    if len(times) and not (times - times.astype('datetime64[D]')).any():
+        return np.datetime_as_string(times, unit='D')
+    return np.datetime_as_string(times, unit='s')
+
+
+def timeseries_figure(df, column, title, y_label, uirevision=None):
+    """WebGL line plot of one column against time, in the dashboard template."""
+    return go.Figure(
+        data=[go.Scattergl(x=time_values(df['time']), y=df[column].to_numpy(), name=column)],
+        layout=dict(template=TEMPLATE, title=dict(text=title), yaxis=dict(title=dict(text=y_label)), uirevision=uirevision),
+    )
+
+
+def add_range_band(fig, df, lower, upper):
+    """Shade the area between two columns behind the main trace, without hover labels.
+
+    The band traces become the first two of the figure (upper, then lower), since traces
+    are drawn in order.
+    """
+    x = time_values(df['time'])
+    fig.add_trace(go.Scattergl(x=x, y=df[upper].to_numpy(), line=dict(width=0), showlegend=False, hoverinfo='skip'))
+    fig.add_trace(go.Scattergl(x=x, y=df[lower].to_numpy(), line=dict(width=0), fill='tonexty',
+                               fillcolor=BAND_COLOR, showlegend=False, hoverinfo='skip'))
+    fig.data = fig.data[-2:] + fig.data[:-2]
+    return fig
@@ -0,0 +1,64 @@
+import os
+import json
+import hashlib
+from functools import lru_cache
+import pandas as pd
+
+POINTS_PATH = os.path.join('assets', 'points.csv')
+# Options the point dropdown holds at a time; the rest are found by typing
+POINT_OPTIONS_LIMIT = int(os.getenv('POINT_OPTIONS_LIMIT', 50))
+
+# Point stations: Points (1-based number), longitude, latitude, label
+points_df = pd.read_csv(POINTS_PATH)
+
+# Changes whenever points.csv does, so browsers never keep a stale points layer
+with open(POINTS_PATH, 'rb') as f:
+    POINTS_VERSION = hashlib.sha1(f.read()).hexdigest()[:12]
+
+
+def point_label(i):
+    return f'Point {i}'
+
+
+def _location(row):
+    return row['label'] if isinstance(row['label'], str) and row['label'] else ''
+
+
+@lru_cache(maxsize=None)
+def points_geojson(point_limit):
+    """FeatureCollection of the first `point_limit` stations as serialized JSON, built once per count."""
+    features = []
+    for row in points_df.head(point_limit).to_dict('records'):
+        features.append({
+            'type': 'Feature',
+            'id': str(row['Points']),
+            'geometry': {'type': 'Point', 'coordinates': [row['longitude'], row['latitude']]},
+            'properties': {
+                'point': str(row['Points']),
+                'tooltip': f"Point: {row['Points']}, Location: {_location(row)}" if _location(row) else f"Point: {row['Points']}",
+            },
+        })
+    return json.dumps({'type': 'FeatureCollection', 'features': features}, separators=(',', ':'))
+
+
+def points_url(point_limit):
+    """URL the map's points layer loads its data from (served by app.py)."""
+    return f'/points/{point_limit}.geojson?v={POINTS_VERSION}'
+
+
+def point_options(point_limit, search=None, selected=None, limit=POINT_OPTIONS_LIMIT):
+    """Dropdown options matching `search` by number or location, at most `limit`, always keeping `selected`."""
+    search = (search or '').strip().lower()
+    options = []
+    for row in points_df.head(point_limit).to_dict('records'):
+        value = str(row['Points'])
+        label = point_label(value)
+        if search and search not in label.lower() and search not in _location(row).lower():
+            continue
+        options.append({'label': label, 'value': value})
+        if len(options) >= limit:
+            break
+    if selected and selected.isdigit() and 1 <= int(selected) <= point_limit and all(o['value'] != selected for o in options):
+        options.insert(0, {'label': point_label(selected), 'value': selected})
+    return options
+
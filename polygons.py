@@ -0,0 +1,124 @@
+"""AOI polygons, pre-baked from the shapefiles into one compact GeoJSON artifact.
+
+`python polygons.py` converts assets/shapefile/ once (fiona and shapely are only needed
+here) and skips the work while the artifact matches the shapefiles; the app reads the
+artifact with the json module. Coordinates are rounded to PRECISION decimals and every
+polygon is stored at each level of DETAIL_LEVELS. The polygons are simplified together
+as one coverage, so neighbouring AOIs keep a single shared border at every level.
+"""
+import os
+import sys
+import json
+import hashlib
+from datasets import POLYGON_COUNT
+
+SHAPEFILE_DIR = os.path.join('assets', 'shapefile')
+ARTIFACT_PATH = os.path.join('assets', 'polygons.json')
+# Bump when the layout of the artifact changes, so an old file is rebuilt rather than misread
+FORMAT_VERSION = 1
+# 5 decimals of a degree is about 1 m
+PRECISION = 5
+# Coverage simplification tolerance of each level of detail: roughly the square root of the
+# area of the triangles removed, in degrees (0.001 keeps borders within ~20 m, 0.002 ~100 m)
+DETAIL_LEVELS = {'full': 0.0, 'medium': 0.001, 'coarse': 0.002}
+DEFAULT_DETAIL = 'medium'
+
+
+def shapefile_names():
+    return [f"Polygons_{i}_MultiPolygon.shp" for i in range(1, POLYGON_COUNT + 1)]
+
+
+def source_hash():
+    """Hash of the shapefiles the artifact is built from, to tell when it is out of date."""
+    digest = hashlib.sha1()
+    for name in shapefile_names():
+        base = os.path.join(SHAPEFILE_DIR, os.path.splitext(name)[0])
+        for extension in ('.shp', '.dbf'):
+            try:
+                with open(base + extension, 'rb') as f:
+                    digest.update(f.read())
+            except OSError:
+                digest.update(b'missing')
+    digest.update(json.dumps([PRECISION, DETAIL_LEVELS], sort_keys=True).encode())
+    return digest.hexdigest()[:16]
+
+
+def _quantize(coordinates):
+    # Round every position and drop the repeats rounding creates
+    if isinstance(coordinates[0], (int, float)):
+        return [round(value, PRECISION) for value in coordinates]
+    quantized = [_quantize(c) for c in coordinates]
+    if isinstance(quantized[0][0], (int, float)):
+        quantized = [p for i, p in enumerate(quantized) if i == 0 or p != quantized[i - 1]]
+    return quantized
+
+
+def build_artifact(path=ARTIFACT_PATH):
+    """Convert the shapefiles into the artifact at `path` and return its version."""
+    import fiona
+    import shapely
+    from shapely.geometry import mapping, shape
+
+    features = []
+    for name in shapefile_names():
+        with fiona.open(os.path.join(SHAPEFILE_DIR, name)) as src:
+            features += [(name, str(i), dict(feature['properties']), shape(feature['geometry'])) for i, feature in enumerate(src)]
+    # Neighbouring AOIs were drawn separately and overlap along their borders; cleaning them into a
+    # coverage gives each border one line, which coverage simplification then moves as one. Snapping
+    # at the stored precision keeps the borders matched once coordinates are rounded.
+    coverage = shapely.coverage_clean([geometry for _, _, _, geometry in features], snapping_distance=10 ** -PRECISION)
+
+    levels = {detail: {name: {'type': 'FeatureCollection', 'features': []} for name in shapefile_names()} for detail in DETAIL_LEVELS}
+    for detail, tolerance in DETAIL_LEVELS.items():
+        geometries = shapely.coverage_simplify(coverage, tolerance) if tolerance else coverage
+        for (name, feature_id, properties, _), geometry in zip(features, geometries):
+            geojson = mapping(geometry)
+            levels[detail][name]['features'].append({
+                'id': feature_id,
+                'type': 'Feature',
+                'properties': properties,
+                'geometry': {'type': geojson['type'], 'coordinates': _quantize(json.loads(json.dumps(geojson['coordinates'])))},
+            })
+
+    version = source_hash()
+    artifact = {'format': FORMAT_VERSION, 'version': version, 'precision': PRECISION,
+                'tolerances': DETAIL_LEVELS, 'levels': levels}
+    tmp_path = f'{path}.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(artifact, f, separators=(',', ':'))
+    os.replace(tmp_path, path)
+    return version
+
+
+def _read_artifact(path):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"Error reading {path}: {e}; run python polygons.py")
+        return None
+
+
+def load_polygons(detail=DEFAULT_DETAIL, path=ARTIFACT_PATH):
+    """Return {shapefile name: FeatureCollection} at one level of detail, or {} when the artifact is unusable.
+
+    Whether the artifact is older than the shapefiles is checked by `python polygons.py`, not here.
+    """
+    artifact = _read_artifact(path)
+    if artifact is None:
+        return {}
+    if artifact.get('format') != FORMAT_VERSION:
+        print(f"{path} has an unsupported format; run python polygons.py")
+        return {}
+    levels = artifact['levels']
+    return levels.get(detail) or levels[DEFAULT_DETAIL]
+
+
+if __name__ == '__main__':
+    current = _read_artifact(ARTIFACT_PATH) if os.path.exists(ARTIFACT_PATH) else None
+    if '--force' not in sys.argv and current is not None and current.get('format') == FORMAT_VERSION \
+            and current.get('version') == source_hash():
+        print(f"{ARTIFACT_PATH} is up to date with the shapefiles (pass --force to rebuild)")
+    else:
+        version = build_artifact()
+        print(f"Wrote {ARTIFACT_PATH} (version {version}, {os.path.getsize(ARTIFACT_PATH)} bytes)")
@@ -0,0 +1,114 @@
+import os
+import hashlib
+import threading
+import pandas as pd
+
+# Pyramid levels and the period each one aggregates (labelled by the period start)
+ROLLUP_LEVELS = {
+    'weekly': 'W-MON',
+    'monthly': 'MS',
+    'seasonal': 'QS-DEC',  # DJF, MAM, JJA, SON
+    'annual': 'YS',
+}
+ROLLUP_STATS = ['mean', 'min', 'max', 'count', 'std']
+
+
+def rollup(df, column, freq):
+    """Aggregate one column of a series into periods of `freq`: time, mean, min, max, count, std."""
+    series = df.set_index('time')[column]
+    level = series.resample(freq, label='left', closed='left').agg(ROLLUP_STATS)
+    level.index.name = 'time'
+    return level.reset_index()
+
+
+def build_pyramid(df, column):
+    return {name: rollup(df, column, freq) for name, freq in ROLLUP_LEVELS.items()}
+
+
+def update_pyramid(pyramid, df, column):
+    """Extend a pyramid with rows appended to the series since it was built.
+
+    Only the last period of each level (which may have been partial) and the periods after
+    it are recomputed, from the tail of the series.
+    """
+    updated = {}
+    for name, freq in ROLLUP_LEVELS.items():
+        level = pyramid[name]
+        if level.empty:
+            updated[name] = rollup(df, column, freq)
+            continue
+        last_period = level['time'].iloc[-1]
+        tail = df[df['time'] >= last_period]
+        updated[name] = pd.concat([level[level['time'] < last_period], rollup(tail, column, freq)], ignore_index=True)
+    return updated
+
+
+class RollupStore:
+    """Rollup pyramids per series and variable, kept in memory and as Parquet files on disk."""
+
+    def __init__(self, directory):
+        self.directory = directory
+        self._lock = threading.Lock()
+        self._pyramids = {}
+
+    def level(self, key, df, column, level):
+        """Return `level` of the pyramid for `key`, building or extending it from `df` as needed."""
+        return self.pyramid(key, df, column)[level]
+
+    def pyramid(self, key, df, column):
+        with self._lock:
+            entry = self._pyramids.get(key) or self._load(key)
+        end = df['time'].iloc[-1] if len(df) else None
+
+        if entry is not None and entry['end'] == end and entry['rows'] == len(df):
+            return entry['levels']
+        if entry is not None and end is not None and entry['end'] is not None and end > entry['end'] \
+                and int(df['time'].searchsorted(entry['end'], side='right')) == entry['rows']:
+            # Rows were only appended: recompute the tail periods
+            levels = update_pyramid(entry['levels'], df, column)
+        else:
+            levels = build_pyramid(df, column)
+
+        entry = {'end': end, 'rows': len(df), 'levels': levels}
+        with self._lock:
+            self._pyramids[key] = entry
+        self._save(key, entry)
+        return levels
+
+    def _path(self, key):
+        return os.path.join(self.directory, hashlib.sha1(key.encode()).hexdigest() + '.parquet')
+
+    def _load(self, key):
+        try:
+            stored = pd.read_parquet(self._path(key))
+        except (OSError, ValueError, ImportError):
+            return None
+        levels = {
+            name: stored[stored['level'] == name].drop(columns='level').reset_index(drop=True)
+            for name in ROLLUP_LEVELS
+        }
+        meta = stored.attrs.get('rollup', {})
+        if meta.get('key') != key:
+            return None
+        entry = {'end': pd.Timestamp(meta['end']) if meta.get('end') else None, 'rows': meta['rows'], 'levels': levels}
+        self._pyramids[key] = entry
+        return entry
+
+    def _save(self, key, entry):
+        stored = pd.concat([level.assign(level=name) for name, level in entry['levels'].items()], ignore_index=True)
+        stored.attrs['rollup'] = {
+            'key': key,
+            'end': entry['end'].isoformat() if entry['end'] is not None else None,
+            'rows': entry['rows'],
+        }
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            path = self._path(key)
+            tmp_path = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+            stored.to_parquet(tmp_path, index=False)
+            os.replace(tmp_path, path)
+        except (OSError, ValueError, ImportError) as e:
+            print(f"Error saving rollups for {key}: {e}")
+
+
+rollup_store = RollupStore(os.getenv('ROLLUP_DIR', os.path.join('.cache', 'rollups')))
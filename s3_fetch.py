@@ -1,294 +1,560 @@
 import pandas as pd
 import os
+import time
+import threading
 import boto3
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from botocore.config import Config
+from botocore.exceptions import BotoCoreError, ClientError
 from dotenv import load_dotenv
-from io import BytesIO
+from datetime import datetime
+from series_cache import SeriesCache
+from arrow_cache import SharedSeriesCache
+from disk_cache import DiskCache
+from singleflight import SingleFlight
+from series_index import series_index
+from columnar import columnar_key, read_parquet_bytes
+from consolidate import consolidated_key, merge_series
+from schemas import parse_csv, schema_for
+from downsample import slice_window
+from datasets import DATASETS, series_keys
 
 # Load environment variables
 load_dotenv()
 
-# Initialize S3 client
+# Upper bound on S3 downloads in flight across all threads of this process
+S3_FETCH_CONCURRENCY = int(os.getenv('S3_FETCH_CONCURRENCY', 16))
+_s3_slots = threading.BoundedSemaphore(S3_FETCH_CONCURRENCY)
+
+# Initialize S3 client (thread-safe, with enough pooled connections for concurrent fetches)
 session = boto3.Session()
 s3_client = session.client(
     's3',
     aws_access_key_id=os.getenv('AWS_ACCESS_KEY_ID'),
     aws_secret_access_key=os.getenv('AWS_SECRET_ACCESS_KEY'),
     endpoint_url=os.getenv('AWS_S3_ENDPOINT'),
-    region_name=os.getenv('AWS_DEFAULT_REGION')
+    region_name=os.getenv('AWS_DEFAULT_REGION'),
+    config=Config(max_pool_connections=S3_FETCH_CONCURRENCY)
 )
+S3_BUCKET = os.getenv('S3_BUCKET', 'wamsi-westport-project-1-1')
 
-# Function to bind data from two S3 keys (for datasets that require it)
-def bind_s3_data(s3_client, bucket, s3_key1, s3_key2):
-    """Fetch and bind two datasets from S3."""
+# In-process cache of parsed objects, keyed by S3 key so every variable of a file shares one entry
+series_cache = SeriesCache(
+    max_bytes=int(os.getenv('SERIES_CACHE_MAX_BYTES', 256 * 1024 * 1024)),
+    ttl=float(os.getenv('SERIES_CACHE_TTL', 3600))
+)
+
+# Parsed frames shared by all worker processes on the host through memory-mapped Arrow files
+SHARED_CACHE_ENABLED = os.getenv('SHARED_CACHE', '1') == '1'
+shared_cache = SharedSeriesCache(
+    directory=os.getenv('SHARED_CACHE_DIR', os.path.join('.cache', 'arrow')),
+    max_bytes=int(os.getenv('SHARED_CACHE_MAX_BYTES', 2 * 1024 * 1024 * 1024)),
+    ttl=series_cache.ttl
+) if SHARED_CACHE_ENABLED else None
+
+# Persistent copy of the raw objects, revalidated with conditional GETs so restarts start warm
+disk_cache = DiskCache(
+    directory=os.getenv('S3_DISK_CACHE_DIR', os.path.join('.cache', 's3')),
+    max_bytes=int(os.getenv('S3_DISK_CACHE_MAX_BYTES', 1024 * 1024 * 1024))
+)
+# Seconds a local copy is served without asking S3 whether it changed
+DISK_CACHE_MAX_AGE = float(os.getenv('S3_DISK_CACHE_MAX_AGE', 0))
+
+def _is_not_modified(error):
+    status = error.response.get('ResponseMetadata', {}).get('HTTPStatusCode')
+    code = error.response.get('Error', {}).get('Code')
+    return status == 304 or code in ('304', 'NotModified')
+
+def fetch_s3_object(s3_client, bucket, s3_key):
+    """Return the raw body of an S3 object, revalidating the on-disk copy with a conditional GET."""
+    cache_key = f'{bucket}/{s3_key}'
+    cached = disk_cache.get(cache_key)
+    request = {'Bucket': bucket, 'Key': s3_key}
+
+    if cached is not None:
+        body, meta = cached
+        if time.time() - meta.get('validated_at', 0) < DISK_CACHE_MAX_AGE:
+            return body
+        if meta.get('etag'):
+            request['IfNoneMatch'] = meta['etag']
+        elif meta.get('last_modified'):
+            request['IfModifiedSince'] = datetime.fromisoformat(meta['last_modified'])
+
+    try:
+        with _s3_slots:
+            response = s3_client.get_object(**request)
+            body = response['Body'].read()
+    except ClientError as e:
+        if cached is not None and _is_not_modified(e):
+            disk_cache.touch(cache_key)
+            return body
+        raise
+    except BotoCoreError as e:
+        # S3 unreachable: a stale local copy is better than no plot
+        if cached is not None:
+            print(f"Serving cached copy of {s3_key}, revalidation failed: {e}")
+            return body
+        raise
+
+    _store_object(cache_key, body, response)
+    return body
+
+def _store_object(cache_key, body, response):
+    last_modified = response.get('LastModified')
+    disk_cache.put(
+        cache_key, body,
+        etag=response.get('ETag'),
+        last_modified=last_modified.isoformat() if last_modified else None
+    )
+
+# Append-only CSVs are refreshed by downloading only the bytes past the cached copy
+TAIL_FETCH_ENABLED = os.getenv('S3_TAIL_FETCH', '1') == '1'
+# Bytes re-read before the cached end of an object to check that its prefix is unchanged
+TAIL_OVERLAP = 1024
+
+def fetch_s3_object_tail(s3_client, bucket, s3_key):
+    """Return (body, appended_from) for an append-only object, downloading only its new tail.
+
+    appended_from is the offset of the first byte added since the cached copy (len(body)
+    when nothing changed), or None when the whole object had to be downloaded.
+    """
+    cache_key = f'{bucket}/{s3_key}'
+    cached = disk_cache.get(cache_key)
+    if cached is None or not cached[1].get('etag') or len(cached[0]) <= TAIL_OVERLAP or not cached[0].endswith(b'\n'):
+        return fetch_s3_object(s3_client, bucket, s3_key), None
+
+    body, meta = cached
+    if time.time() - meta.get('validated_at', 0) < DISK_CACHE_MAX_AGE:
+        return body, len(body)
+
+    start = len(body) - TAIL_OVERLAP
     try:
-        # Fetch data from S3 key 1
-        response1 = s3_client.get_object(Bucket=bucket, Key=s3_key1)
-        data1 = response1['Body'].read()
-        df1 = pd.read_csv(BytesIO(data1))
+        with _s3_slots:
+            response = s3_client.get_object(
+                Bucket=bucket, Key=s3_key, Range=f'bytes={start}-', IfNoneMatch=meta['etag']
+            )
+            tail = response['Body'].read()
+    except ClientError as e:
+        if _is_not_modified(e):
+            disk_cache.touch(cache_key)
+            return body, len(body)
+        if e.response.get('Error', {}).get('Code') == 'InvalidRange':
+            # The object shrank, so it was rewritten rather than appended to
+            return fetch_s3_object(s3_client, bucket, s3_key), None
+        raise
+    except BotoCoreError as e:
+        print(f"Serving cached copy of {s3_key}, revalidation failed: {e}")
+        return body, len(body)
+
+    status = response.get('ResponseMetadata', {}).get('HTTPStatusCode')
+    if status == 206 and tail[:TAIL_OVERLAP] == body[start:]:
+        new_body = body + tail[TAIL_OVERLAP:]
+        _store_object(cache_key, new_body, response)
+        return new_body, len(body)
+    if status == 200:
+        # The range was ignored and the whole object came back
+        _store_object(cache_key, tail, response)
+        return tail, None
+    # The prefix no longer matches: fall back to a full fetch
+    return fetch_s3_object(s3_client, bucket, s3_key), None
+
+# Loads of the same object in flight, so a burst of identical requests costs one S3 round trip
+_flights = SingleFlight()
+
+# Read the Parquet copy of a series when one exists, falling back to the CSV
+COLUMNAR_ENABLED = os.getenv('S3_COLUMNAR', '1') == '1'
+# Optional objects (Parquet copies, consolidated series) found missing, so fallbacks do not probe S3 on every request
+_missing_objects = {}
+_missing_lock = threading.Lock()
+
+def _is_missing(error):
+    # GET answers NoSuchKey, HEAD a bare 404, and without s3:ListBucket both answer 403 for a
+    # missing key; throttling and server errors are not absence
+    status = error.response.get('ResponseMetadata', {}).get('HTTPStatusCode')
+    code = error.response.get('Error', {}).get('Code')
+    return status in (403, 404) or code in ('NoSuchKey', '404', 'NotFound', 'AccessDenied', '403')
+
+def _known_missing(bucket, s3_key):
+    with _missing_lock:
+        missing_since = _missing_objects.get((bucket, s3_key))
+    return missing_since is not None and time.monotonic() - missing_since <= (series_cache.ttl or float('inf'))
+
+def _mark_missing(bucket, s3_key):
+    with _missing_lock:
+        _missing_objects[(bucket, s3_key)] = time.monotonic()
+
+def _shared_get(cache_key):
+    # A frame another worker already parsed is adopted into this process' cache with its age
+    if shared_cache is None:
+        return None
+    entry = shared_cache.get(cache_key)
+    if entry is None:
+        return None
+    df, age = entry
+    series_cache.put(cache_key, df, age=age)
+    return df
+
+def _shared_peek(cache_key):
+    return shared_cache.peek(cache_key) if shared_cache is not None else None
+
+def _store(cache_key, df):
+    # The memory-mapped copy is what this process keeps, so workers share one copy of the data
+    if shared_cache is not None:
+        df = shared_cache.put(cache_key, df)
+    series_cache.put(cache_key, df)
+    return df
 
-        # Fetch data from S3 key 2
-        response2 = s3_client.get_object(Bucket=bucket, Key=s3_key2)
-        data2 = response2['Body'].read()
-        df2 = pd.read_csv(BytesIO(data2))
+def _cached_csv(s3_client, bucket, s3_key, schema=None):
+    cache_key = f'{bucket}/{s3_key}'
+    df = series_cache.get(cache_key)
+    if df is None:
+        df = _shared_get(cache_key)
+    if df is not None:
+        return df
+    # Concurrent misses for the same object share one download and parse
+    return _flights.do(cache_key, _load_csv, s3_client, bucket, s3_key, schema)
 
-        # Convert 'time' column to datetime format
-        df1['time'] = pd.to_datetime(df1['time'])
-        df2['time'] = pd.to_datetime(df2['time'])
+def _load_csv(s3_client, bucket, s3_key, schema=None):
+    cache_key = f'{bucket}/{s3_key}'
+    # A previous flight may have filled the cache between our miss and becoming leader
+    df = series_cache.get(cache_key, record_stats=False)
+    if df is None:
+        df = _shared_get(cache_key)
+    if df is not None:
+        return df
 
-        # Reset the index to avoid issues with index alignment
-        df1 = df1.reset_index(drop=True)
-        df2 = df2.reset_index(drop=True)
+    if TAIL_FETCH_ENABLED:
+        body, appended_from = fetch_s3_object_tail(s3_client, bucket, s3_key)
+    else:
+        body, appended_from = fetch_s3_object(s3_client, bucket, s3_key), None
 
-        # Concatenate the two dataframes row-wise (axis=0)
-        merged_df = pd.concat([df1, df2], axis=0, ignore_index=True)
+    # An expired frame parsed from exactly the old bytes only needs the new rows appended
+    stale = series_cache.peek(cache_key)
+    if stale is None:
+        stale = _shared_peek(cache_key)
+    if stale is not None and appended_from is not None and stale.attrs.get('source_bytes') == appended_from:
+        df = _append_csv_tail(stale, body, appended_from, schema)
+    else:
+        df = parse_csv(body, schema)
+        df.attrs['columns'] = [c for c in df.columns if c != 'time']
+    df.attrs['source_bytes'] = len(body)
+    if 'time' in df.columns and len(df):
+        df.attrs['last_time'] = df['time'].max()
+    return _store(cache_key, df)
 
-        # Sort by time column
-        merged_df = merged_df.sort_values(by='time')
+def _append_csv_tail(df, body, offset, schema=None):
+    tail = body[offset:]
+    if not tail.strip():
+        return df
+    header = body[:body.index(b'\n') + 1]
+    new_rows = parse_csv(header + tail, schema)
+    last_time = df.attrs.get('last_time')
+    if last_time is not None and 'time' in new_rows.columns:
+        new_rows = new_rows[new_rows['time'] > last_time]
+    appended = pd.concat([df, new_rows], axis=0, ignore_index=True)
+    appended.attrs['columns'] = df.attrs.get('columns', [c for c in appended.columns if c != 'time'])
+    return appended
 
-        # Remove any duplicate entries (optional, but useful if there's overlap)
-        merged_df = merged_df.drop_duplicates(subset=['time'])
+def _has_columns(df, columns):
+    # Columns the file does not have never make a cached frame incomplete
+    wanted = df.attrs.get('columns', []) if columns is None else [c for c in columns if c in df.attrs.get('columns', [])]
+    return all(c in df.columns for c in wanted)
+
+def _cached_parquet(s3_client, bucket, s3_key, columns=None):
+    """Return the frame of a Parquet copy holding at least `columns`, revalidated once it expires."""
+    cache_key = f'{bucket}/{s3_key}'
+    df = series_cache.get(cache_key)
+    if df is None:
+        df = _shared_get(cache_key)
+    if df is not None and _has_columns(df, columns):
+        return df
+    # One flight per object, so no two loads race to store it; each load widens the cached frame to
+    # the columns it already held plus the ones asked for, and a caller that joined a flight for
+    # other columns goes again
+    while True:
+        df = _flights.do(cache_key, _load_parquet, s3_client, bucket, s3_key, columns)
+        if _has_columns(df, columns):
+            return df
+
+def _load_parquet(s3_client, bucket, s3_key, columns=None):
+    cache_key = f'{bucket}/{s3_key}'
+    df = series_cache.get(cache_key, record_stats=False)
+    if df is None:
+        df = _shared_get(cache_key)
+    if df is not None and _has_columns(df, columns):
+        return df
+    # An expired frame is revalidated with the conditional GET of the object, like a CSV
+    expired = df is None
+    if df is None:
+        df = series_cache.peek(cache_key)
+    if df is None:
+        df = _shared_peek(cache_key)
+    if columns is not None and df is not None:
+        columns = [c for c in df.columns if c != 'time'] + list(columns)
+    body = fetch_s3_object(s3_client, bucket, s3_key)
+    etag = (disk_cache.meta(cache_key) or {}).get('etag')
+    if expired and df is not None and etag and df.attrs.get('etag') == etag and _has_columns(df, columns):
+        # Not modified: the decoded frame serves another TTL
+        series_cache.put(cache_key, df)
+        if shared_cache is not None:
+            shared_cache.touch(cache_key)
+        return df
+    # Only the wanted columns are decoded; the others stay compressed in the local copy of the object
+    df = read_parquet_bytes(body, columns)
+    df.attrs['source_bytes'] = len(body)
+    df.attrs['etag'] = etag
+    return _store(cache_key, df)
+
+def _project(df, columns, window=None):
+    # Always hand out a copy so callers can convert or filter columns without touching the cached frame
+    all_columns = df.attrs.get('columns', [c for c in df.columns if c != 'time'])
+    if window is not None:
+        # Cached frames are sorted by time: cut the window by binary search, so only its rows are copied
+        df = slice_window(df, *window)
+    if columns is None:
+        projected = df.copy()
+    else:
+        projected = df[[c for c in dict.fromkeys(['time'] + list(columns)) if c in df.columns]].copy()
+    projected.attrs['columns'] = all_columns
+    return projected
+
+def read_s3_series(s3_client, bucket, s3_key, columns=None, schema=None, window=None):
+    """Read `time` plus the requested columns of a series, from its Parquet copy when there is one.
+
+    CSVs are parsed with the dataset `schema` (see schemas.py), so every frame leaves typed.
+    A (start, end) `window` returns only those rows, plus one neighbour each side.
+    """
+    if COLUMNAR_ENABLED:
+        parquet_key = columnar_key(s3_key)
+        if not _known_missing(bucket, parquet_key):
+            try:
+                # A CSV appended to since the last conversion is served through its tail path instead
+                if _snapshot_fresh(s3_client, bucket, parquet_key, (s3_key,)):
+                    return _project(_cached_parquet(s3_client, bucket, parquet_key, columns), columns, window)
+            except ClientError as e:
+                if not _is_missing(e):
+                    raise
+                # Not converted yet
+                _mark_missing(bucket, parquet_key)
+    return _project(_cached_csv(s3_client, bucket, s3_key, schema), columns, window)
+
+def cache_stats():
+    """Return hit/miss counters and byte usage of the series cache, plus coalesced fetches."""
+    stats = series_cache.stats()
+    stats['coalesced'] = _flights.coalesced
+    stats['in_flight'] = _flights.in_flight()
+    stats['shared_bytes'] = shared_cache.size() if shared_cache is not None else 0
+    return stats
+
+def fetch_many(s3_client, bucket, s3_keys, columns=None, schema=None, return_exceptions=False):
+    """Fetch and parse several series objects concurrently, returning {key: DataFrame}.
+
+    Downloads in flight are bounded process-wide by S3_FETCH_CONCURRENCY, so batches
+    can be nested safely. With `return_exceptions` failed keys map to their exception.
+    """
+    s3_keys = list(dict.fromkeys(s3_keys))
+    if len(s3_keys) == 1:
+        try:
+            return {s3_keys[0]: read_s3_series(s3_client, bucket, s3_keys[0], columns, schema)}
+        except Exception as e:
+            if not return_exceptions:
+                raise
+            return {s3_keys[0]: e}
+
+    results = {}
+    with ThreadPoolExecutor(max_workers=min(len(s3_keys), S3_FETCH_CONCURRENCY) or 1) as pool:
+        futures = {pool.submit(read_s3_series, s3_client, bucket, key, columns, schema): key for key in s3_keys}
+        for future in as_completed(futures):
+            key = futures[future]
+            try:
+                results[key] = future.result()
+            except Exception as e:
+                if not return_exceptions:
+                    raise
+                results[key] = e
+    return results
+
+def fetch_series_many(s3_client, bucket, series, variable=None):
+    """Fetch many (dataset_type, aoi_type, coordinate) series concurrently, returning {series: DataFrame}."""
+    series = list(dict.fromkeys(series))
+    results = {}
+    with ThreadPoolExecutor(max_workers=min(len(series), S3_FETCH_CONCURRENCY) or 1) as pool:
+        futures = {
+            pool.submit(fetch_data_from_s3, s3_client, bucket, dataset_type, aoi_type, coordinate, variable): (dataset_type, aoi_type, coordinate)
+            for dataset_type, aoi_type, coordinate in series
+        }
+        for future in as_completed(futures):
+            try:
+                results[futures[future]] = future.result()[0]
+            except Exception as e:
+                print(f"Error fetching {futures[future]}: {e}")
+                results[futures[future]] = None
+    return results
+
+# Function to bind data from two S3 keys (for datasets that require it)
+def bind_s3_data(s3_client, bucket, s3_key1, s3_key2, columns=None, schema=None):
+    """Fetch and bind two datasets from S3."""
+    try:
+        # Fetch both halves concurrently
+        frames = fetch_many(s3_client, bucket, [s3_key1, s3_key2], columns, schema)
+        df1 = frames[s3_key1]
+        df2 = frames[s3_key2]
+
+        # Merge, sort and de-duplicate exactly as the ingest-time consolidation does
+        merged_df = merge_series(df1, df2)
+        merged_df.attrs['columns'] = list(dict.fromkeys(df1.attrs.get('columns', []) + df2.attrs.get('columns', [])))
+        merged_df.attrs['source_bytes'] = df1.attrs.get('source_bytes', 0) + df2.attrs.get('source_bytes', 0)
 
         return merged_df
     except Exception as e:
         print(f"Error binding data from S3: {e}")
         return None
 
+# Objects derived from others (consolidated series, Parquet copies) checked against their
+# sources: (bucket, key) -> (checked_at, fresh, ETags of the sources)
+_snapshot_checks = {}
+_snapshot_lock = threading.Lock()
+
+def _snapshot_fresh(s3_client, bucket, target, sources):
+    """Whether a derived object was written after its sources last changed; re-checked once per series TTL."""
+    with _snapshot_lock:
+        checked = _snapshot_checks.get((bucket, target))
+    if checked is not None and time.monotonic() - checked[0] <= (series_cache.ttl or float('inf')):
+        return checked[1]
+    with _s3_slots:
+        modified = s3_client.head_object(Bucket=bucket, Key=target)['LastModified']
+    try:
+        with _s3_slots:
+            heads = [s3_client.head_object(Bucket=bucket, Key=key) for key in sources]
+    except ClientError as e:
+        # Only the derived object is optional: a source that cannot be read is for its own read to report
+        print(f"Error checking the sources of {target}: {e}")
+        return False
+    fresh = all(modified >= head['LastModified'] for head in heads)
+    if not fresh:
+        print(f"{target} is older than {', '.join(sources)}, reading the latter until it is rewritten")
+    with _snapshot_lock:
+        _snapshot_checks[(bucket, target)] = (time.monotonic(), fresh, [head.get('ETag') for head in heads])
+    return fresh
+
+def _bound_version(bucket, target):
+    # ETags of the sources seen by the last freshness check, None before the first one
+    with _snapshot_lock:
+        checked = _snapshot_checks.get((bucket, target))
+    return checked[2] if checked is not None else None
+
+def _cached_bound(bucket, target, columns):
+    cache_key = f'{bucket}/{target}#bound'
+    df = series_cache.get(cache_key, record_stats=False)
+    if df is None:
+        # The sources' ETags, not the TTL, say when a bind is out of date
+        df = series_cache.peek(cache_key)
+    if df is None:
+        df = _shared_peek(cache_key)
+    version = _bound_version(bucket, target)
+    if df is None or version is None or df.attrs.get('parts') != version:
+        return None, False
+    return df, _has_columns(df, columns)
+
+def _read_bound(s3_client, bucket, target, s3_key1, s3_key2, columns=None, schema=None, window=None):
+    """Bind the sources of a stale consolidated series, keeping the merge until one of them changes."""
+    df, complete = _cached_bound(bucket, target, columns)
+    if complete:
+        return _project(df, columns, window)
+    cache_key = f'{bucket}/{target}#bound'
+    while True:
+        df = _flights.do(cache_key, _load_bound, s3_client, bucket, target, s3_key1, s3_key2, columns, schema)
+        if df is None:
+            return None
+        if _has_columns(df, columns):
+            return _project(df, columns, window)
+
+def _load_bound(s3_client, bucket, target, s3_key1, s3_key2, columns=None, schema=None):
+    df, complete = _cached_bound(bucket, target, columns)
+    if complete:
+        return df
+    if columns is not None and df is not None:
+        columns = [c for c in df.columns if c != 'time'] + list(columns)
+    version = _bound_version(bucket, target)
+    df = bind_s3_data(s3_client, bucket, s3_key1, s3_key2, columns, schema)
+    if df is None or version is None:
+        return df
+    df.attrs['parts'] = version
+    return _store(f'{bucket}/{target}#bound', df)
+
+def read_consolidated(s3_client, bucket, s3_key1, s3_key2, columns=None, schema=None, window=None):
+    """Read a split series from its consolidated object, binding the two parts if it is missing or stale."""
+    target = consolidated_key(s3_key1)
+    if not _known_missing(bucket, target):
+        try:
+            # A source appended to since the last consolidation makes the snapshot stale
+            if _snapshot_fresh(s3_client, bucket, target, (s3_key1, s3_key2)):
+                return read_s3_series(s3_client, bucket, target, columns, schema, window)
+            return _read_bound(s3_client, bucket, target, s3_key1, s3_key2, columns, schema, window)
+        except ClientError as e:
+            if not _is_missing(e):
+                raise
+            print(f"No consolidated series at {target}, binding {s3_key1} and {s3_key2}")
+            _mark_missing(bucket, target)
+    df = bind_s3_data(s3_client, bucket, s3_key1, s3_key2, columns, schema)
+    return slice_window(df, *window) if df is not None and window is not None else df
+
 def fetch_data_from_s3(s3_client, bucket, dataset_type, aoi_type, coordinate, variable):
     """Fetch data from a single S3 key or bind datasets when necessary."""
-    s3_key = None
-    title = None
-
-    # Handle datasets that require data binding (e.g., mur)
-    if dataset_type == "mur":
-        if aoi_type == 'point':
-            if coordinate is not None:
-                s3_key1 = f'csiem-data/data-lake/NASA/GHRSST/Points/ghrsst_sst_point_{coordinate}.csv'
-                s3_key2 = f'csiem-data/data-lake/NASA/GHRSST/Points/2002-2023/GHRSST_sst_point_{coordinate}.csv'
-
-                # Use the binding function to combine data
-                df = bind_s3_data(s3_client, bucket, s3_key1, s3_key2)
-                title = f'Timeseries Analysis of {variable} for the Point {coordinate}'
-                return df, title
-        elif aoi_type == 'polygon':
-            if coordinate is not None:
-                s3_key1 = f'csiem-data/data-lake/NASA/GHRSST/Polygon_offshore/ghrsst_sst_polygon_{coordinate}.csv'
-                s3_key2 = f'csiem-data/data-lake/NASA/GHRSST/Polygon_offshore/2002-2023/ghrsst_offshore_sst_polygon_{coordinate}.csv'
-
-                # Use the binding function to combine data
-                df = bind_s3_data(s3_client, bucket, s3_key1, s3_key2)
-                title = f'Timeseries Analysis of {variable} for the Polygon {coordinate}'
-                return df, title
-    elif dataset_type == "poc":
-        if aoi_type == 'point':
-            if coordinate is not None:
-                s3_key1 = f'csiem-data/data-lake/NASA/MODIS/POC/Points/MODIS_POC_point_{coordinate}.csv'
-                s3_key2 = f'csiem-data/data-lake/NASA/MODIS/POC/Points/2003-2022/Aq-MODIS_POC_point_{coordinate}.csv'
-
-                # Use the binding function to combine data
-                df = bind_s3_data(s3_client, bucket, s3_key1, s3_key2)
-                title = f'Timeseries Analysis of {variable} for the Point {coordinate}'
-                return df, title
-        elif aoi_type == 'polygon':
-            if coordinate is not None:
-                s3_key1 = f'csiem-data/data-lake/NASA/MODIS/POC/Polygon/MODIS_POC_polygon_{coordinate}.csv'
-                s3_key2 = f'csiem-data/data-lake/NASA/MODIS/POC/Polygon/2003-2022/MODIS_POC_polygon_{coordinate}.csv'
-
-                # Use the binding function to combine data
-                df = bind_s3_data(s3_client, bucket, s3_key1, s3_key2)
-                title = f'Timeseries Analysis of {variable} for the Polygon {coordinate}'
-                return df, title
-            
-    elif dataset_type == "pic":
-        if aoi_type == 'point':
-            if coordinate is not None:
-                s3_key1 = f'csiem-data/data-lake/NASA/MODIS/PIC/Points/MODIS_PIC_point_{coordinate}.csv'
-                s3_key2 = f'csiem-data/data-lake/NASA/MODIS/PIC/Points/2003-2022/Aq-MODIS_PIC_point_{coordinate}.csv'
-
-                # Use the binding function to combine data
-                df = bind_s3_data(s3_client, bucket, s3_key1, s3_key2)
-                title = f'Timeseries Analysis of {variable} for the Point {coordinate}'
-                return df, title
-        elif aoi_type == 'polygon':
-            if coordinate is not None:
-                s3_key1 = f'csiem-data/data-lake/NASA/MODIS/PIC/Polygon/MODIS_PIC_polygon_{coordinate}.csv'
-                s3_key2 = f'csiem-data/data-lake/NASA/MODIS/PIC/Polygon/2003-2022/MODIS_PIC_polygon_{coordinate}.csv'
-
-                # Use the binding function to combine data
-                df = bind_s3_data(s3_client, bucket, s3_key1, s3_key2)
-                title = f'Timeseries Analysis of {variable} for the Polygon {coordinate}'
-                return df, title
-    elif dataset_type == "par":
-        if aoi_type == 'point':
-            if coordinate is not None:
-                s3_key1 = f'csiem-data/data-lake/NASA/MODIS/PAR/Points/MODIS_PAR_point_{coordinate}.csv'
-                s3_key2 = f'csiem-data/data-lake/NASA/MODIS/PAR/Points/2003-2022/Aq-MODIS_PAR_point_{coordinate}.csv'
-
-                # Use the binding function to combine data
-                df = bind_s3_data(s3_client, bucket, s3_key1, s3_key2)
-                title = f'Timeseries Analysis of {variable} for the Point {coordinate}'
-                return df, title
-        elif aoi_type == 'polygon':
-            if coordinate is not None:
-                s3_key1 = f'csiem-data/data-lake/NASA/MODIS/PAR/Polygon/MODIS_PAR_polygon_{coordinate}.csv'
-                s3_key2 = f'csiem-data/data-lake/NASA/MODIS/PAR/Polygon/2003-2022/MODIS_PAR_polygon_{coordinate}.csv'
-
-                # Use the binding function to combine data
-                df = bind_s3_data(s3_client, bucket, s3_key1, s3_key2)
-                title = f'Timeseries Analysis of {variable} for the Polygon {coordinate}'
-                return df, title
-    elif dataset_type == "ostia":
-        if aoi_type == 'point':
-            if coordinate is not None:
-                s3_key1 = f'csiem-data/data-lake/UKMO/OSTIA/Temperature/Points/CMEMS_SST_point_{coordinate}.csv'
-                s3_key2 = f'csiem-data/data-lake/UKMO/OSTIA/Temperature/Points/1981-2006/SST_19811001_20061231_point_{coordinate}.csv'
-
-                # Use the binding function to combine data
-                df = bind_s3_data(s3_client, bucket, s3_key1, s3_key2)
-                title = f'Timeseries Analysis of {variable} for the Point {coordinate}'
-                return df, title
-        elif aoi_type == 'polygon':
-            if coordinate is not None:
-                s3_key1 = f'csiem-data/data-lake/UKMO/OSTIA/Temperature/Polygon/CMEMS_SST_polygon_{coordinate}.csv'
-                s3_key2 = f'csiem-data/data-lake/UKMO/OSTIA/Temperature/Polygon/1981-2006/CMEMS_SST_polygon_{coordinate}.csv'
-
-                # Use the binding function to combine data
-                df = bind_s3_data(s3_client, bucket, s3_key1, s3_key2)
-                title = f'Timeseries Analysis of {variable} for the Polygon {coordinate}'
-                return df, title
-
-    # Handle datasets that do not require binding
-    elif dataset_type == "plankton":
-        if aoi_type == 'point':
-            if coordinate is not None:
-                s3_key = f'csiem-data/data-lake/ESA/GlobColor/Plankton/Points/CMEMS_planktons_point_{coordinate}.csv'
-                title = f'Timeseries Analysis of {variable} for the Point {coordinate}'
-        elif aoi_type == 'polygon':
-            if coordinate is not None:
-                s3_key = f'csiem-data/data-lake/ESA/GlobColor/Plankton/Polygon/CMEMS_planktons_polygon_{coordinate}.csv'
-                title = f'Timeseries Analysis of {variable} for the Polygon {coordinate}'
-    if dataset_type == "olci":
-        if aoi_type == 'point':
-            if coordinate is not None:
-                s3_key = f'csiem-data/data-lake/ESA/Sentinel/Points/CMEMS_OLCI_CHL_point_{coordinate}.csv'
-                title = f'Timeseries Analysis of {variable} for the Point {coordinate}'
-        elif aoi_type == 'polygon':
-            if coordinate is not None:
-                s3_key = f'csiem-data/data-lake/ESA/Sentinel/Polygon_offshore/CMEMS_OLCI_CHL_polygon_{coordinate}.csv'
-                title = f'Timeseries Analysis of {variable} for the Polygon {coordinate}'
-    elif dataset_type == "reflectance":
-        if aoi_type == 'point':
-            if coordinate is not None:
-                s3_key = f'csiem-data/data-lake/ESA/GlobColor/Reflectance/Point/CMEMS_reflectance_point_{coordinate}.csv'
-                title = f'Timeseries Analysis of {variable} for the Point {coordinate}'
-        elif aoi_type == 'polygon':
-            if coordinate is not None:
-                s3_key = f'csiem-data/data-lake/ESA/GlobColor/Reflectance/Polygon/CMEMS_reflectance_polygon_{coordinate}.csv'
-                title = f'Timeseries Analysis of {variable} for the Polygon {coordinate}'
-    elif dataset_type == "transp":
-        if aoi_type == 'point':
-            if coordinate is not None:
-                s3_key = f'csiem-data/data-lake/ESA/GlobColor/Transp/Point/CMEMS_transp_point_{coordinate}.csv'
-                title = f'Timeseries Analysis of {variable} for the Point {coordinate}'
-        elif aoi_type == 'polygon':
-            if coordinate is not None:
-                s3_key = f'csiem-data/data-lake/ESA/GlobColor/Transp/Polygon/CMEMS_transp_polygon_{coordinate}.csv'
-                title = f'Timeseries Analysis of {variable} for the Polygon {coordinate}'
-    elif dataset_type == "optics":
-        if aoi_type == 'point':
-            if coordinate is not None:
-                s3_key = f'csiem-data/data-lake/ESA/GlobColor/Optics/Point/CMEMS_optics_point_{coordinate}.csv'
-                title = f'Timeseries Analysis of {variable} for the Point {coordinate}'
-        elif aoi_type == 'polygon':
-            if coordinate is not None:
-                s3_key = f'csiem-data/data-lake/ESA/GlobColor/Optics/Polygon/CMEMS_optics_polygon_{coordinate}.csv'
-                title = f'Timeseries Analysis of {variable} for the Polygon {coordinate}'
-    elif dataset_type == "pp":
-        if aoi_type == 'point':
-            if coordinate is not None:
-                s3_key = f'csiem-data/data-lake/ESA/GlobColor/PP/Point/CMEMS_PP_point_{coordinate}.csv'
-                title = f'Timeseries Analysis of {variable} for the Point {coordinate}'
-        elif aoi_type == 'polygon':
-            if coordinate is not None:
-                s3_key = f'csiem-data/data-lake/ESA/GlobColor/PP/Polygon/CMEMS_PP_polygon_{coordinate}.csv'
-                title = f'Timeseries Analysis of {variable} for the Polygon {coordinate}'
-    ## update the code for here
-    elif dataset_type == "mod_bio":
-        if aoi_type == 'point':
-            if coordinate is not None:
-                s3_key = f'csiem-data/data-lake/MOI/PISCES/Model_bio/Points/CMEMS_bio_point_{coordinate}.csv'
-                title = f'Timeseries Analysis of {variable} for the Point {coordinate}'
-        elif aoi_type == 'polygon':
-            if coordinate is not None:
-                s3_key = f'csiem-data/data-lake/MOI/PISCES/Model_bio/Polygon/CMEMS_bio_polygon_{coordinate}.csv'
-                title = f'Timeseries Analysis of {variable} for the Polygon {coordinate}'
-    elif dataset_type == "mod_nut":
-        if aoi_type == 'point':
-            if coordinate is not None:
-                s3_key = f'csiem-data/data-lake/MOI/PISCES/Model_Nut/Points/CMEMS_nut_point_{coordinate}.csv'
-                title = f'Timeseries Analysis of {variable} for the Point {coordinate}'
-        elif aoi_type == 'polygon':
-            if coordinate is not None:
-                s3_key = f'csiem-data/data-lake/MOI/PISCES/Model_Nut/Polygon/CMEMS_nut_polygon_{coordinate}.csv'
-                title = f'Timeseries Analysis of {variable} for the Polygon {coordinate}'
-    elif dataset_type == "mod_optics":
-        if aoi_type == 'point':
-            if coordinate is not None:
-                s3_key = f'csiem-data/data-lake/MOI/PISCES/Model_optics/Points/CMEMS_optics_point_{coordinate}.csv'
-                title = f'Timeseries Analysis of {variable} for the Point {coordinate}'
-        elif aoi_type == 'polygon':
-            if coordinate is not None:
-                s3_key = f'csiem-data/data-lake/MOI/PISCES/Model_optics/Polygon/CMEMS_optics_polygon_{coordinate}.csv'
-                title = f'Timeseries Analysis of {variable} for the Polygon {coordinate}'
-    elif dataset_type == "mod_car":
-        if aoi_type == 'point':
-            if coordinate is not None:
-                s3_key = f'csiem-data/data-lake/MOI/PISCES/Model_car/Points/CMEMS_car_point_{coordinate}.csv'
-                title = f'Timeseries Analysis of {variable} for the Point {coordinate}'
-        elif aoi_type == 'polygon':
-            if coordinate is not None:
-                s3_key = f'csiem-data/data-lake/MOI/PISCES/Model_car/Polygon/CMEMS_car_polygon_{coordinate}.csv'
-                title = f'Timeseries Analysis of {variable} for the Polygon {coordinate}'
-    elif dataset_type == "mod_co2":
-        if aoi_type == 'point':
-            if coordinate is not None:
-                s3_key = f'csiem-data/data-lake/MOI/PISCES/Model_co2/Points/CMEMS_co2_point_{coordinate}.csv'
-                title = f'Timeseries Analysis of {variable} for the Point {coordinate}'
-        elif aoi_type == 'polygon':
-            if coordinate is not None:
-                s3_key = f'csiem-data/data-lake/MOI/PISCES/Model_co2/Polygon/CMEMS_co2_polygon_{coordinate}.csv'
-                title = f'Timeseries Analysis of {variable} for the Polygon {coordinate}'
-    elif dataset_type == "mod_pfts":
-        if aoi_type == 'point':
-            if coordinate is not None:
-                s3_key = f'csiem-data/data-lake/MOI/PISCES/Model_pft/Points/CMEMS_pft_point_{coordinate}.csv'
-                title = f'Timeseries Analysis of {variable} for the Point {coordinate}'
-        elif aoi_type == 'polygon':
-            if coordinate is not None:
-                s3_key = f'csiem-data/data-lake/MOI/PISCES/Model_pft/Polygon/CMEMS_pft_polygon_{coordinate}.csv'
-                title = f'Timeseries Analysis of {variable} for the Polygon {coordinate}'
-    elif dataset_type == "mod_biomass":
-        if aoi_type == 'point':
-            if coordinate is not None:
-                s3_key = f'csiem-data/data-lake/MOI/SEAPODYM/Model_PP_ZO/Points/CMEMS_npp_zooc_point_{coordinate}.csv'
-                title = f'Timeseries Analysis of {variable} for the Point {coordinate}'
-        elif aoi_type == 'polygon':
-            if coordinate is not None:
-                s3_key = f'csiem-data/data-lake/MOI/SEAPODYM/Model_PP_ZO/Polygon/CMEMS_npp_zooc_polygon_{coordinate}.csv'
-                title = f'Timeseries Analysis of {variable} for the Polygon {coordinate}'
-    elif dataset_type == "mod_sal":
-        if aoi_type == 'point':
-            if coordinate is not None:
-                s3_key = f'csiem-data/data-lake/MOI/NEMO/Model_salinity/Points/CMEMS_Salt_point_{coordinate}.csv'
-                title = f'Timeseries Analysis of {variable} for the Point {coordinate}'
-        elif aoi_type == 'polygon':
-            if coordinate is not None:
-                s3_key = f'csiem-data/data-lake/MOI/NEMO/Model_salinity/Polygon/CMEMS_Salt_polygon_{coordinate}.csv'
-                title = f'Timeseries Analysis of {variable} for the Polygon {coordinate}'
-    
-    if s3_key is None or title is None:
+    df, title = _fetch_series(s3_client, bucket, dataset_type, aoi_type, coordinate, variable)
+    if df is not None:
+        # Keep the metadata index in step with what was actually served
+        series_index.record(dataset_type, aoi_type, coordinate, df)
+    return df, title
+
+def warm_series(s3_client, bucket, dataset_type, aoi_type, coordinate):
+    """Load every variable of a series into the caches and the index, returning the frame (None if unavailable)."""
+    columns = [entry['value'] for entry in DATASETS[dataset_type]['variables']]
+    df, _ = _fetch_series(s3_client, bucket, dataset_type, aoi_type, coordinate, None, columns)
+    if df is not None:
+        series_index.record(dataset_type, aoi_type, coordinate, df)
+    return df
+
+def series_version(bucket, dataset_type, aoi_type, coordinate):
+    """Token that changes whenever the data served for a series does, None while nothing of it is cached.
+
+    Built without touching S3 or pandas: the ETags and sizes the disk cache holds for the objects
+    the series can be read from, plus the rows and last time its index entry recorded, so it
+    moves as soon as a refresh replaces an object or appends rows.
+    """
+    s3_keys = series_keys(dataset_type, aoi_type, coordinate)
+    if s3_keys is None:
+        return None
+    if len(s3_keys) == 2:
+        s3_keys = [consolidated_key(s3_keys[0]), *s3_keys]
+    parts = []
+    for s3_key in s3_keys:
+        for key in (s3_key, columnar_key(s3_key)):
+            meta = disk_cache.meta(f'{bucket}/{key}')
+            if meta is not None:
+                parts.append(f"{meta.get('etag')}:{meta.get('size')}")
+    entry = series_index.get(dataset_type, aoi_type, coordinate)
+    if entry is not None:
+        parts.append(f"{entry['rows']}:{entry['end']}")
+    return '/'.join(parts) or None
+
+def fetch_series_window(s3_client, bucket, dataset_type, aoi_type, coordinate, variable, start, end):
+    """Fetch the rows of a series between `start` and `end` (plus one neighbour each side), e.g. for a zoom."""
+    df, _ = _fetch_series(s3_client, bucket, dataset_type, aoi_type, coordinate, variable, window=(start, end))
+    return df
+
+def _fetch_series(s3_client, bucket, dataset_type, aoi_type, coordinate, variable, columns=None, window=None):
+    # The registry resolves the S3 key(s) of a series in one lookup
+    s3_keys = series_keys(dataset_type, aoi_type, coordinate)
+    if s3_keys is None:
         return None, None
+    title = f'Timeseries Analysis of {variable} for the {aoi_type.capitalize()} {coordinate}'
+    # Only the time axis and the plotted variable are read, typed per the dataset schema
+    if columns is None:
+        columns = [variable] if variable else []
+    schema = schema_for(dataset_type)
 
-    response = s3_client.get_object(Bucket=bucket, Key=s3_key)
-    data = response['Body'].read()
-    df = pd.read_csv(BytesIO(data))
-    return df, title
\ No newline at end of file
+    if len(s3_keys) == 2:
+        # Read the series consolidated at ingest; binding per request is only a fallback
+        return read_consolidated(s3_client, bucket, *s3_keys, columns, schema, window), title
+    return read_s3_series(s3_client, bucket, s3_keys[0], columns, schema, window), title
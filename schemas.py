@@ -0,0 +1,50 @@
+import os
+import pandas as pd
+from io import BytesIO
+from datasets import DATASETS, DEFAULT_TIME_FORMAT, time_format
+
+# Parse CSVs with the multi-threaded pyarrow reader unless told otherwise
+try:
+    import pyarrow  # noqa: F401
+    CSV_ENGINE = os.getenv('CSV_ENGINE', 'pyarrow')
+except ImportError:
+    CSV_ENGINE = 'c'
+
+
+def _float32(*names):
+    return {name: 'float32' for name in names}
+
+
+# Columns kept for each dataset with their dtypes, from the variables declared in the
+# registry, plus the format of its time column. Float32 holds ~7 significant digits,
+# more than any of these satellite or model products carry.
+SCHEMAS = {
+    dataset_type: {
+        'columns': _float32(*(variable['value'] for variable in dataset['variables'])),
+        'time_format': time_format(dataset_type),
+    }
+    for dataset_type, dataset in DATASETS.items()
+}
+
+
+def schema_for(dataset_type):
+    return SCHEMAS.get(dataset_type)
+
+
+def parse_csv(body, schema=None):
+    """Parse a CSV body in one pass into a typed frame: datetime `time`, declared dtypes, only declared columns."""
+    end = body.find(b'\n')
+    header = body[:end if end >= 0 else len(body)].decode('utf-8-sig').strip().split(',')
+    header = [name.strip().strip('"') for name in header]
+
+    kwargs = {'engine': CSV_ENGINE}
+    if schema is not None:
+        keep = ['time'] + list(schema['columns'])
+        kwargs['usecols'] = [name for name in header if name in keep]
+        kwargs['dtype'] = {name: dtype for name, dtype in schema['columns'].items() if name in header}
+    df = pd.read_csv(BytesIO(body), **kwargs)
+
+    if 'time' in df.columns and not pd.api.types.is_datetime64_any_dtype(df['time']):
+        pattern = (schema or {}).get('time_format', DEFAULT_TIME_FORMAT)
+        df['time'] = pd.to_datetime(df['time'], format=pattern)
+    return df
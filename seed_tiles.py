@@ -0,0 +1,97 @@
+import os
+import sys
+import math
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from tiles import TileError, get_tile, is_cached, tile_layers
+
+# Cockburn Sound study area (west, south, east, north): every point and polygon plus the opening map view
+STUDY_BBOX = (114.7, -32.9, 116.1, -31.4)
+SEED_MIN_ZOOM = int(os.getenv('SEED_MIN_ZOOM', 6))
+SEED_MAX_ZOOM = int(os.getenv('SEED_MAX_ZOOM', 13))
+SEED_WORKERS = int(os.getenv('SEED_WORKERS', 8))
+# Upstream tile requests per second, so seeding stays polite to the public tile servers
+SEED_RATE = float(os.getenv('SEED_RATE', 20))
+
+
+class RateLimiter:
+    """Spaces calls to `wait` at least 1/rate seconds apart across threads."""
+
+    def __init__(self, rate):
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self._next = time.monotonic()
+        self._lock = threading.Lock()
+
+    def wait(self):
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next)
+            self._next = start + self.interval
+        if start > now:
+            time.sleep(start - now)
+
+
+def tile_range(bbox, z):
+    """Yield (z, x, y) of the Web Mercator tiles covering `bbox` at zoom `z`."""
+    west, south, east, north = bbox
+    n = 2 ** z
+
+    def column(lon):
+        return min(n - 1, max(0, int((lon + 180) / 360 * n)))
+
+    def row(lat):
+        lat = math.radians(lat)
+        return min(n - 1, max(0, int((1 - math.asinh(math.tan(lat)) / math.pi) / 2 * n)))
+
+    for x in range(column(west), column(east) + 1):
+        for y in range(row(north), row(south) + 1):
+            yield z, x, y
+
+
+def seed_tiles(layer_ids=None, bbox=STUDY_BBOX, zooms=None, missing_only=False,
+               workers=SEED_WORKERS, rate=SEED_RATE):
+    """Fetch every tile of the overlays over `bbox` into the tile cache; returns (fetched, skipped, failed).
+
+    By default every tile is fetched again, so a run after a data update replaces what the
+    cache holds; with `missing_only` tiles that are still fresh in the cache are skipped.
+    """
+    layers = tile_layers()
+    for unknown in set(layer_ids or []) - set(layers):
+        print(f"Unknown tile layer {unknown}")
+    layer_ids = [i for i in layer_ids if i in layers] if layer_ids else list(layers)
+    zooms = zooms or range(SEED_MIN_ZOOM, SEED_MAX_ZOOM + 1)
+    jobs = [(layer_id, *tile) for layer_id in layer_ids for z in zooms for tile in tile_range(bbox, z)]
+    limiter = RateLimiter(rate)
+    counts = {'fetched': 0, 'skipped': 0, 'failed': 0}
+
+    def seed(layer_id, z, x, y):
+        if missing_only and is_cached(layer_id, z, x, y):
+            return 'skipped'
+        limiter.wait()
+        # A failed refresh must not pass off the old copy as fetched
+        get_tile(layer_id, z, x, y, refresh=True, raise_on_error=True)
+        return 'fetched'
+
+    print(f"Seeding {len(jobs)} tiles of {len(layer_ids)} layers at zoom {min(zooms)}-{max(zooms)}")
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        futures = {pool.submit(seed, *job): job for job in jobs}
+        for done, future in enumerate(as_completed(futures), start=1):
+            try:
+                counts[future.result()] += 1
+            except TileError:
+                counts['failed'] += 1
+            except Exception as e:
+                # Anything else (e.g. a full disk) fails this tile, not the whole run
+                print(f"Error seeding tile {futures[future]}: {e}")
+                counts['failed'] += 1
+            if done % 1000 == 0:
+                print(f"{done}/{len(jobs)} tiles")
+    return counts['fetched'], counts['skipped'], counts['failed']
+
+
+if __name__ == '__main__':
+    # Optional layer ids (see `python tiles.py`) limit seeding to those overlays
+    selected = [arg for arg in sys.argv[1:] if not arg.startswith('--')]
+    fetched, skipped, failed = seed_tiles(selected or None, missing_only='--missing-only' in sys.argv)
+    print(f"Fetched {fetched} tiles, skipped {skipped} cached, {failed} failed")
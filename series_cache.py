@@ -0,0 +1,88 @@
+import time
+import threading
+from collections import OrderedDict
+
+
+class SeriesCache:
+    """Memory-bounded LRU cache of parsed DataFrames, keyed by S3 object."""
+
+    def __init__(self, max_bytes, ttl=None):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, record_stats=True):
+        """Return the cached frame for `key`, or None on a miss or expired entry."""
+        with self._lock:
+            entry = self._entries.get(key)
+            # Expired entries stay until replaced or evicted, so a refresh can build on them via peek()
+            if entry is None or self._expired(entry):
+                if record_stats:
+                    self.misses += 1
+                return None
+            # Mark as most recently used
+            self._entries.move_to_end(key)
+            if record_stats:
+                self.hits += 1
+            return entry['df']
+
+    def peek(self, key):
+        """Return the frame for `key` even if it has expired, without touching LRU order or counters."""
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry['df'] if entry is not None else None
+
+    def put(self, key, df, age=0):
+        """Store a frame, evicting least recently used entries to stay under the byte budget.
+
+        `age` is how many seconds old the frame already is, so it expires with its source.
+        """
+        nbytes = int(df.memory_usage(index=True, deep=True).sum())
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            # A single frame larger than the whole budget is never cached
+            if nbytes > self.max_bytes:
+                return
+            while self._entries and self.current_bytes + nbytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+            self._entries[key] = {'df': df, 'nbytes': nbytes, 'stored_at': time.monotonic() - age}
+            self.current_bytes += nbytes
+
+    def invalidate(self, key):
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'bytes': self.current_bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+            }
+
+    def _expired(self, entry):
+        # A TTL of 0 or None disables expiry
+        return bool(self.ttl) and time.monotonic() - entry['stored_at'] > self.ttl
+
+    def _remove(self, key):
+        entry = self._entries.pop(key)
+        self.current_bytes -= entry['nbytes']
@@ -0,0 +1,108 @@
+import os
+import json
+import threading
+from datetime import datetime, timezone
+from datasets import iter_series
+
+
+def series_id(dataset_type, aoi_type, coordinate):
+    return f'{dataset_type}/{aoi_type}/{coordinate}'
+
+
+class SeriesIndex:
+    """Per-series metadata (time range, row count, columns, last update) persisted as JSON."""
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._mtime = None
+        self._entries = self._load()
+
+    def get(self, dataset_type, aoi_type, coordinate):
+        with self._lock:
+            self._reload_if_changed()
+            return self._entries.get(series_id(dataset_type, aoi_type, coordinate))
+
+    def __contains__(self, sid):
+        with self._lock:
+            self._reload_if_changed()
+            return sid in self._entries
+
+    def record(self, dataset_type, aoi_type, coordinate, df):
+        """Update the entry for a freshly fetched series; the file is only rewritten when something changed."""
+        if df is None or df.empty or 'time' not in df.columns:
+            return None
+        times = df['time']
+        summary = {
+            'start': times.min().isoformat(),
+            'end': times.max().isoformat(),
+            'rows': int(len(df)),
+            'columns': df.attrs.get('columns', [c for c in df.columns if c != 'time']),
+        }
+        sid = series_id(dataset_type, aoi_type, coordinate)
+        with self._lock:
+            self._reload_if_changed()
+            entry = self._entries.get(sid)
+            if entry is not None and all(entry.get(k) == v for k, v in summary.items()):
+                return entry
+            summary['last_update'] = datetime.now(timezone.utc).isoformat()
+            self._entries[sid] = summary
+            self._save()
+            return summary
+
+    def _load(self):
+        try:
+            self._mtime = os.stat(self.path).st_mtime_ns
+            with open(self.path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _reload_if_changed(self):
+        """Pick up entries recorded by other processes (e.g. other server workers) since the last read."""
+        try:
+            mtime = os.stat(self.path).st_mtime_ns
+        except OSError:
+            return
+        if mtime != self._mtime:
+            self._entries.update(self._load())
+
+    def _save(self):
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        tmp_path = f'{self.path}.{os.getpid()}.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(self._entries, f, indent=1, sort_keys=True)
+        os.replace(tmp_path, self.path)
+        self._mtime = os.stat(self.path).st_mtime_ns
+
+
+series_index = SeriesIndex(os.getenv('SERIES_INDEX_PATH', os.path.join('.cache', 'series_index.json')))
+
+
+def build_series_index(s3_client, bucket, refresh=False):
+    """Index every series in the catalogue; without `refresh` only missing entries are fetched."""
+    # Imported here because s3_fetch records into the index on every fetch
+    from s3_fetch import fetch_series_many
+
+    pending = [
+        series for series in iter_series()
+        if refresh or series_id(*series) not in series_index
+    ]
+    # fetch_data_from_s3 records each series into the index as a side effect
+    frames = fetch_series_many(s3_client, bucket, pending)
+    return sum(df is not None for df in frames.values())
+
+
+def start_index_build(s3_client, bucket):
+    """Fill in missing index entries on a background thread."""
+    thread = threading.Thread(target=build_series_index, args=(s3_client, bucket), name='series-index', daemon=True)
+    thread.start()
+    return thread
+
+
+if __name__ == '__main__':
+    import sys
+    from s3_fetch import s3_client, S3_BUCKET
+
+    count = build_series_index(s3_client, S3_BUCKET, refresh='--refresh' in sys.argv)
+    print(f"Indexed {count} series into {series_index.path}")
@@ -0,0 +1,79 @@
+import os
+import hashlib
+import tempfile
+from io import BytesIO
+from datetime import datetime, timedelta, timezone
+
+# The app modules create their caches at import time, so point them at a scratch directory first
+_CACHE_ROOT = tempfile.mkdtemp(prefix='seaf-tests-')
+os.environ.update({
+    'S3_DISK_CACHE_DIR': os.path.join(_CACHE_ROOT, 's3'),
+    'SHARED_CACHE': '0',
+    'SHARED_CACHE_DIR': os.path.join(_CACHE_ROOT, 'arrow'),
+    'TILE_CACHE_DIR': os.path.join(_CACHE_ROOT, 'tiles'),
+    'MEMO_BACKEND': 'none',
+    'MEMO_DIR': os.path.join(_CACHE_ROOT, 'memo'),
+    'ROLLUP_DIR': os.path.join(_CACHE_ROOT, 'rollups'),
+    'SERIES_INDEX_PATH': os.path.join(_CACHE_ROOT, 'series_index.json'),
+    'WARMUP_PROGRESS_FILE': os.path.join(_CACHE_ROOT, 'warmup.json'),
+    'AWS_ACCESS_KEY_ID': 'test',
+    'AWS_SECRET_ACCESS_KEY': 'test',
+    'AWS_DEFAULT_REGION': 'us-east-1',
+})
+
+import pytest
+from botocore.exceptions import ClientError
+
+
+def _error(code, status):
+    return ClientError({'Error': {'Code': code}, 'ResponseMetadata': {'HTTPStatusCode': status}}, 'GetObject')
+
+
+class FakeS3:
+    """In-memory stand-in for the parts of the S3 client s3_fetch uses, recording every GET."""
+
+    def __init__(self):
+        self.objects = {}
+        self.modified = {}
+        self.requests = []
+        # Without s3:ListBucket, S3 answers 403 rather than 404 for a missing key
+        self.can_list = True
+
+    def put(self, key, body):
+        self.objects[key] = body
+        # Each write is a second later than the previous one
+        self.modified[key] = datetime(2024, 1, 1, tzinfo=timezone.utc) + timedelta(seconds=len(self.modified) + 1)
+
+    def head_object(self, Bucket, Key):
+        if Key not in self.objects:
+            raise _error('404', 404) if self.can_list else _error('403', 403)
+        return {'ETag': self._etag(Key), 'LastModified': self.modified[Key]}
+
+    def _etag(self, key):
+        return '"%s"' % hashlib.md5(self.objects[key]).hexdigest()
+
+    def get_object(self, Bucket, Key, Range=None, IfNoneMatch=None, IfModifiedSince=None):
+        self.requests.append({'key': Key, 'range': Range, 'if_none_match': IfNoneMatch})
+        if Key not in self.objects:
+            raise _error('NoSuchKey', 404) if self.can_list else _error('AccessDenied', 403)
+        body = self.objects[Key]
+        etag = self._etag(Key)
+        if IfNoneMatch == etag:
+            raise _error('NotModified', 304)
+        status = 200
+        if Range:
+            start = int(Range[len('bytes='):].rstrip('-'))
+            if start >= len(body):
+                raise _error('InvalidRange', 416)
+            body, status = body[start:], 206
+        return {
+            'Body': BytesIO(body),
+            'ETag': etag,
+            'LastModified': self.modified[Key],
+            'ResponseMetadata': {'HTTPStatusCode': status},
+        }
+
+
+@pytest.fixture
+def fake_s3():
+    return FakeS3()
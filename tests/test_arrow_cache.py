@@ -0,0 +1,22 @@
+import pandas as pd
+from arrow_cache import SharedSeriesCache
+
+
+def _frame(rows=100):
+    return pd.DataFrame({
+        'time': pd.date_range('2020-01-01', periods=rows, freq='D'),
+        'CHL': pd.Series(range(rows), dtype='float32'),
+    })
+
+
+def test_shared_cache_round_trip_keeps_attrs(tmp_path):
+    cache = SharedSeriesCache(str(tmp_path), max_bytes=10 ** 8, ttl=60)
+    df = _frame()
+    df.attrs.update(columns=['CHL'], source_bytes=1234, last_time=df['time'].max())
+    cache.put('bucket/key', df)
+
+    stored, age = cache.get('bucket/key')
+    pd.testing.assert_frame_equal(stored, df)
+    assert stored.attrs['source_bytes'] == 1234
+    assert stored.attrs['last_time'] == df['time'].max()
+    assert cache.contains('bucket/key') and not cache.contains('bucket/other')
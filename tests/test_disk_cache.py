@@ -0,0 +1,64 @@
+import os
+import time
+import disk_cache
+from disk_cache import DiskCache
+
+
+def test_disk_cache_round_trip_keeps_the_validators(tmp_path):
+    cache = DiskCache(str(tmp_path), max_bytes=10 ** 6)
+    cache.put('bucket/key', b'payload' * 100, etag='"abc"', last_modified='2024-01-01T00:00:00+00:00')
+
+    body, meta = cache.get('bucket/key')
+    assert body == b'payload' * 100
+    assert meta['etag'] == '"abc"'
+    assert meta['last_modified'] == '2024-01-01T00:00:00+00:00'
+    # Bodies are stored gzip-compressed
+    assert cache.size() < 700
+
+
+def test_disk_cache_evicts_the_oldest_objects(tmp_path):
+    cache = DiskCache(str(tmp_path), max_bytes=2500, compress=False)
+    for i in range(3):
+        cache.put(f'key{i}', bytes(1000))
+        time.sleep(0.02)
+
+    assert cache.get('key0') is None
+    assert cache.get('key2') is not None
+
+
+def test_disk_cache_touch_records_a_revalidation(tmp_path):
+    cache = DiskCache(str(tmp_path), max_bytes=10 ** 6)
+    cache.put('bucket/key', b'payload')
+    validated_at = cache.get('bucket/key')[1]['validated_at']
+    time.sleep(0.01)
+    cache.touch('bucket/key')
+
+    assert cache.get('bucket/key')[1]['validated_at'] > validated_at
+
+
+def test_disk_cache_stores_raw_bodies_when_uncompressed(tmp_path):
+    cache = DiskCache(str(tmp_path), max_bytes=10 ** 6, compress=False)
+    cache.put('tiles/9/459/302', b'payload' * 100, etag='"abc"')
+
+    body, meta = cache.get('tiles/9/459/302')
+    assert body == b'payload' * 100
+    assert meta['etag'] == '"abc"'
+    assert cache.size() >= 700
+
+
+def test_disk_cache_scans_the_directory_only_when_over_the_cap(tmp_path, monkeypatch):
+    cache = DiskCache(str(tmp_path), max_bytes=10000, compress=False)
+    scans = []
+    listdir = os.listdir
+    monkeypatch.setattr(disk_cache.os, 'listdir', lambda path: scans.append(path) or listdir(path))
+    for i in range(10):
+        cache.put(f'key{i}', bytes(1000))
+        cache.put(f'key{i}', bytes(1000))
+    assert scans == []
+
+    # Going over the cap evicts down to the low-water mark in one pass
+    time.sleep(0.02)
+    cache.put('key10', bytes(1000))
+    assert len(scans) == 1
+    assert cache.size() <= 10000 * disk_cache.LOW_WATER
+    assert cache.get('key10') is not None
@@ -0,0 +1,59 @@
+import numpy as np
+import pandas as pd
+from downsample import downsample_series, lttb, slice_window, target_points
+
+
+def _series(n, column='CHL'):
+    return pd.DataFrame({
+        'time': pd.date_range('2000-01-01', periods=n, freq='D'),
+        column: np.sin(np.linspace(0, 20, n)),
+    })
+
+
+def test_target_points_rounds_widths_up_to_a_shared_budget():
+    assert target_points(801) == target_points(900) == 1800
+    assert target_points(None) == target_points(1200)
+
+
+def test_lttb_keeps_the_endpoints_and_the_peak():
+    x = np.arange(1000, dtype=float)
+    y = np.zeros(1000)
+    y[437] = 10.0
+
+    picked = lttb(x, y, 50)
+
+    assert len(picked) == 50
+    assert picked[0] == 0 and picked[-1] == 999
+    assert 437 in picked
+    assert np.all(np.diff(picked) > 0)
+
+
+def test_lttb_returns_every_index_when_under_the_threshold():
+    assert list(lttb(np.arange(10.0), np.arange(10.0), 20)) == list(range(10))
+
+
+def test_downsample_series_leaves_short_series_untouched():
+    df = _series(100)
+    pd.testing.assert_frame_equal(downsample_series(df, 'CHL', 200), df)
+
+
+def test_downsample_series_keeps_gaps_in_the_line():
+    df = _series(5000)
+    df.loc[2000:2100, 'CHL'] = np.nan
+
+    reduced = downsample_series(df, 'CHL', 300)
+
+    assert len(reduced) <= 302
+    assert reduced['time'].is_monotonic_increasing
+    # One missing row survives between the samples either side of the gap
+    assert reduced['CHL'].isna().sum() == 1
+
+
+def test_slice_window_includes_one_neighbour_each_side():
+    df = _series(10)
+
+    window = slice_window(df, '2000-01-04', '2000-01-06')
+
+    assert window['time'].iloc[0] == pd.Timestamp('2000-01-03')
+    assert window['time'].iloc[-1] == pd.Timestamp('2000-01-07')
+    assert len(slice_window(df)) == 10
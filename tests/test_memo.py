@@ -0,0 +1,39 @@
+import time
+from memo import DiskBackend, Memo, MemoryBackend
+
+
+def test_memory_memo_backend_evicts_by_bytes():
+    backend = MemoryBackend(max_entries=100, max_bytes=25)
+    for key in 'abcde':
+        backend.set(key, b'x' * 10, ttl=60)
+    backend.set('big', b'x' * 30, ttl=60)
+
+    assert backend.get('a') is None and backend.get('big') is None
+    assert backend.get('d') is not None and backend.get('e') is not None
+    assert backend.current_bytes == 20
+
+
+def test_disk_memo_backend_evicts_least_recently_read(tmp_path):
+    backend = DiskBackend(str(tmp_path), max_bytes=60)
+    for key in 'abc':
+        backend.set(key, b'x' * 5, ttl=60)
+        time.sleep(0.02)
+        backend.get('a')
+        time.sleep(0.02)
+
+    assert backend.get('a') == b'x' * 5
+    assert backend.get('b') is None
+
+
+def test_memo_recomputes_when_the_version_changes():
+    memo = Memo(MemoryBackend(max_entries=10, max_bytes=10 ** 6), ttl=60)
+    computed = []
+
+    def compute():
+        computed.append(1)
+        return {'rows': len(computed)}
+
+    assert memo.cached('plot', ['olci', '1'], 'v1', compute) == {'rows': 1}
+    assert memo.cached('plot', ['olci', '1'], 'v1', compute) == {'rows': 1}
+    assert memo.cached('plot', ['olci', '1'], 'v2', compute) == {'rows': 2}
+    assert memo.stats()['hits'] == 1
@@ -0,0 +1,48 @@
+import numpy as np
+import pandas as pd
+from rollups import ROLLUP_LEVELS, RollupStore, build_pyramid, rollup, update_pyramid
+
+
+def _series(start, periods):
+    rng = np.random.default_rng(0)
+    return pd.DataFrame({
+        'time': pd.date_range(start, periods=periods, freq='D'),
+        'CHL': rng.random(periods),
+    })
+
+
+def test_monthly_rollup_matches_a_groupby():
+    df = _series('2020-01-01', 120)
+
+    monthly = rollup(df, 'CHL', ROLLUP_LEVELS['monthly'])
+
+    expected = df.groupby(df['time'].dt.to_period('M'))['CHL'].agg(['mean', 'min', 'max', 'count'])
+    assert list(monthly['time']) == [p.to_timestamp() for p in expected.index]
+    np.testing.assert_allclose(monthly['mean'], expected['mean'])
+    np.testing.assert_array_equal(monthly['count'], expected['count'])
+
+
+def test_update_pyramid_equals_a_rebuild_after_an_append():
+    full = _series('2019-11-15', 400)
+    # The cut falls mid-week, mid-month and mid-season, so every level has a partial last period
+    pyramid = build_pyramid(full.iloc[:300], 'CHL')
+
+    updated = update_pyramid(pyramid, full, 'CHL')
+    rebuilt = build_pyramid(full, 'CHL')
+
+    for name in ROLLUP_LEVELS:
+        pd.testing.assert_frame_equal(updated[name], rebuilt[name])
+
+
+def test_store_extends_and_persists_pyramids(tmp_path):
+    full = _series('2019-11-15', 400)
+    store = RollupStore(str(tmp_path))
+    store.pyramid('olci/point/1/CHL', full.iloc[:300], 'CHL')
+
+    levels = store.pyramid('olci/point/1/CHL', full, 'CHL')
+    pd.testing.assert_frame_equal(levels['weekly'], build_pyramid(full, 'CHL')['weekly'])
+
+    # A new store (another process) reads the pyramid back from disk
+    entry = RollupStore(str(tmp_path))._load('olci/point/1/CHL')
+    assert entry is not None and entry['rows'] == 400
+    pd.testing.assert_frame_equal(entry['levels']['monthly'], levels['monthly'], check_dtype=False)
@@ -0,0 +1,232 @@
+import pandas as pd
+import pytest
+import s3_fetch
+from columnar import to_parquet_bytes
+from datasets import series_keys
+from s3_fetch import TAIL_OVERLAP, fetch_s3_object_tail, read_s3_series
+from schemas import parse_csv
+
+BUCKET = 'test-bucket'
+
+
+def _csv(start, periods, header=True):
+    times = pd.date_range(start, periods=periods, freq='D')
+    lines = [f"{t:%Y-%m-%d},{i * 0.5}" for i, t in enumerate(times)]
+    return (('time,CHL\n' if header else '') + '\n'.join(lines) + '\n').encode()
+
+
+@pytest.fixture(autouse=True)
+def clean_caches():
+    s3_fetch.series_cache.clear()
+    s3_fetch._missing_objects.clear()
+    s3_fetch._snapshot_checks.clear()
+    yield
+    s3_fetch.series_cache.clear()
+
+
+def test_append_csv_tail_adds_only_rows_after_the_cached_end():
+    body = _csv('2020-01-01', 100)
+    df = parse_csv(body)
+    df.attrs['columns'] = ['CHL']
+    df.attrs['last_time'] = df['time'].max()
+    # The new tail repeats the last cached day, which must not be duplicated
+    appended = body + _csv('2020-04-09', 5, header=False)
+
+    merged = s3_fetch._append_csv_tail(df, appended, len(body))
+
+    assert len(merged) == 104
+    assert merged['time'].is_monotonic_increasing and not merged['time'].duplicated().any()
+    assert merged.attrs['columns'] == ['CHL']
+    pd.testing.assert_frame_equal(merged.iloc[:100], df)
+
+
+def test_append_csv_tail_without_new_bytes_returns_the_frame():
+    body = _csv('2020-01-01', 10)
+    df = parse_csv(body)
+    assert s3_fetch._append_csv_tail(df, body, len(body)) is df
+
+
+def test_tail_fetch_downloads_only_the_appended_bytes(fake_s3):
+    key = 'tail/append.csv'
+    body = _csv('2000-01-01', 500)
+    fake_s3.put(key, body)
+    assert fetch_s3_object_tail(fake_s3, BUCKET, key) == (body, None)
+
+    grown = body + _csv('2001-05-16', 10, header=False)
+    fake_s3.put(key, grown)
+    new_body, appended_from = fetch_s3_object_tail(fake_s3, BUCKET, key)
+
+    assert new_body == grown
+    assert appended_from == len(body)
+    assert fake_s3.requests[-1]['range'] == f'bytes={len(body) - TAIL_OVERLAP}-'
+
+
+def test_tail_fetch_of_an_unchanged_object_is_a_not_modified(fake_s3):
+    key = 'tail/unchanged.csv'
+    body = _csv('2000-01-01', 500)
+    fake_s3.put(key, body)
+    fetch_s3_object_tail(fake_s3, BUCKET, key)
+
+    assert fetch_s3_object_tail(fake_s3, BUCKET, key) == (body, len(body))
+
+
+def test_tail_fetch_of_a_rewritten_object_downloads_it_whole(fake_s3):
+    key = 'tail/rewritten.csv'
+    fake_s3.put(key, _csv('2000-01-01', 500))
+    fetch_s3_object_tail(fake_s3, BUCKET, key)
+
+    rewritten = _csv('1990-01-01', 800)
+    fake_s3.put(key, rewritten)
+
+    assert fetch_s3_object_tail(fake_s3, BUCKET, key) == (rewritten, None)
+
+
+def test_expired_series_is_refreshed_by_appending_the_tail(fake_s3, monkeypatch):
+    key = 'tail/series.csv'
+    body = _csv('2000-01-01', 500)
+    fake_s3.put(key, body)
+    first = read_s3_series(fake_s3, BUCKET, key, ['CHL'])
+    assert len(first) == 500
+
+    # Expire the cached frame, then append a week of rows to the object
+    monkeypatch.setattr(s3_fetch.series_cache, 'ttl', 1e-9)
+    fake_s3.put(key, body + _csv('2001-05-16', 7, header=False))
+    refreshed = read_s3_series(fake_s3, BUCKET, key, ['CHL'])
+
+    assert len(refreshed) == 507
+    assert refreshed['time'].iloc[-1] == pd.Timestamp('2001-05-22')
+    assert fake_s3.requests[-1]['range'] is not None
+    pd.testing.assert_frame_equal(refreshed.iloc[:500], first)
+
+
+def test_missing_parquet_copy_falls_back_to_the_csv(fake_s3):
+    key = 'fallback/series.csv'
+    fake_s3.put(key, _csv('2000-01-01', 20))
+
+    assert len(read_s3_series(fake_s3, BUCKET, key, ['CHL'])) == 20
+    assert s3_fetch._known_missing(BUCKET, 'fallback/series.parquet')
+
+
+
+def test_missing_parquet_copy_without_list_permission_falls_back_to_the_csv(fake_s3):
+    fake_s3.can_list = False
+    key = 'fallback/denied.csv'
+    fake_s3.put(key, _csv('2000-01-01', 20))
+
+    assert len(read_s3_series(fake_s3, BUCKET, key, ['CHL'])) == 20
+    assert s3_fetch._known_missing(BUCKET, 'fallback/denied.parquet')
+
+
+def test_parquet_copy_decodes_only_the_columns_asked_for(fake_s3):
+    body = _csv('2000-01-01', 20)
+    fake_s3.put('columnar/series.csv', body)
+    df = parse_csv(body)
+    df['TEMP'] = df['CHL'] + 10
+    fake_s3.put('columnar/series.parquet', to_parquet_bytes(df))
+    cache_key = f'{BUCKET}/columnar/series.parquet'
+
+    chl = read_s3_series(fake_s3, BUCKET, 'columnar/series.csv', ['CHL'])
+    assert list(chl.columns) == ['time', 'CHL']
+    assert list(s3_fetch.series_cache.peek(cache_key).columns) == ['time', 'CHL']
+
+    # A second variable widens the cached frame to both columns
+    temp = read_s3_series(fake_s3, BUCKET, 'columnar/series.csv', ['TEMP'])
+    assert list(temp.columns) == ['time', 'TEMP']
+    assert list(s3_fetch.series_cache.peek(cache_key).columns) == ['time', 'CHL', 'TEMP']
+    assert temp.attrs['columns'] == ['CHL', 'TEMP']
+
+
+
+
+def test_expired_parquet_copy_is_revalidated_not_dropped(fake_s3, monkeypatch):
+    body = _csv('2000-01-01', 20)
+    fake_s3.put('columnar/expiring.csv', body)
+    fake_s3.put('columnar/expiring.parquet', to_parquet_bytes(parse_csv(body)))
+    assert len(read_s3_series(fake_s3, BUCKET, 'columnar/expiring.csv', ['CHL'])) == 20
+
+    monkeypatch.setattr(s3_fetch.series_cache, 'ttl', 1e-9)
+    assert len(read_s3_series(fake_s3, BUCKET, 'columnar/expiring.csv', ['CHL'])) == 20
+
+    # The copy answered a conditional GET and the CSV was never downloaded
+    last = fake_s3.requests[-1]
+    assert last['key'] == 'columnar/expiring.parquet' and last['if_none_match'] is not None
+    assert all(request['key'] != 'columnar/expiring.csv' for request in fake_s3.requests)
+
+
+def test_csv_newer_than_its_parquet_copy_is_read_instead(fake_s3):
+    body = _csv('2000-01-01', 20)
+    fake_s3.put('columnar/appended.csv', body)
+    fake_s3.put('columnar/appended.parquet', to_parquet_bytes(parse_csv(body)))
+    # Rows appended after the conversion
+    fake_s3.put('columnar/appended.csv', body + _csv('2000-01-21', 5, header=False))
+
+    df = read_s3_series(fake_s3, BUCKET, 'columnar/appended.csv', ['CHL'])
+
+    assert len(df) == 25
+    assert all(request['key'] != 'columnar/appended.parquet' for request in fake_s3.requests)
+
+
+def test_stale_consolidated_series_is_bound_once_per_version_of_its_sources(fake_s3, monkeypatch):
+    current, historical = 'split/current.csv', 'split/historical.csv'
+    fake_s3.put('split/consolidated/current.csv', _csv('2000-01-01', 30))
+    fake_s3.put(historical, _csv('2000-01-01', 20))
+    fake_s3.put(current, _csv('2000-01-21', 10))
+    merges = []
+    merge_series = s3_fetch.merge_series
+    monkeypatch.setattr(s3_fetch, 'merge_series', lambda *frames: merges.append(1) or merge_series(*frames))
+
+    for _ in range(3):
+        assert len(s3_fetch.read_consolidated(fake_s3, BUCKET, current, historical, ['CHL'])) == 30
+    assert merges == [1]
+
+    # An append to a source changes its ETag, which the next freshness check picks up
+    fake_s3.put(current, _csv('2000-01-21', 12))
+    s3_fetch._snapshot_checks.clear()
+    s3_fetch.series_cache.invalidate(f'{BUCKET}/{current}')
+    assert len(s3_fetch.read_consolidated(fake_s3, BUCKET, current, historical, ['CHL'])) == 32
+    assert merges == [1, 1]
+
+
+
+def test_window_read_returns_the_rows_in_view(fake_s3):
+    key = 'window/series.csv'
+    fake_s3.put(key, _csv('2000-01-01', 500))
+
+    window = read_s3_series(fake_s3, BUCKET, key, ['CHL'], window=('2000-02-01', '2000-02-10'))
+
+    # One neighbour each side, so the line reaches the edges of the view
+    assert window['time'].iloc[0] == pd.Timestamp('2000-01-31')
+    assert window['time'].iloc[-1] == pd.Timestamp('2000-02-11')
+    assert list(window.columns) == ['time', 'CHL']
+    assert window.attrs['columns'] == ['CHL']
+
+
+
+def test_series_version_reads_only_cached_metadata(fake_s3, monkeypatch):
+    key = series_keys('olci', 'point', '1')[0]
+    monkeypatch.setattr(s3_fetch.series_cache, 'ttl', 1e-9)
+    assert s3_fetch.series_version(BUCKET, 'olci', 'point', '1') is None
+
+    body = _csv('2000-01-01', 50)
+    fake_s3.put(key, body)
+    s3_fetch.fetch_data_from_s3(fake_s3, BUCKET, 'olci', 'point', '1', 'CHL')
+    requests = len(fake_s3.requests)
+    version = s3_fetch.series_version(BUCKET, 'olci', 'point', '1')
+    assert version is not None and len(fake_s3.requests) == requests
+
+    # A refresh that appends rows moves the version
+    fake_s3.put(key, body + _csv('2000-02-20', 3, header=False))
+    s3_fetch.fetch_data_from_s3(fake_s3, BUCKET, 'olci', 'point', '1', 'CHL')
+    assert s3_fetch.series_version(BUCKET, 'olci', 'point', '1') != version
+
+
+def test_cache_stats_count_hits_and_misses(fake_s3):
+    key = 'stats/series.csv'
+    fake_s3.put(key, _csv('2000-01-01', 20))
+    before = s3_fetch.cache_stats()
+    read_s3_series(fake_s3, BUCKET, key, ['CHL'])
+    read_s3_series(fake_s3, BUCKET, key, ['CHL'])
+
+    stats = s3_fetch.cache_stats()
+    assert stats['hits'] - before['hits'] >= 1
+    assert stats['in_flight'] == 0
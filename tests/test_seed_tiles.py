@@ -0,0 +1,57 @@
+import os
+import math
+import pytest
+import disk_cache
+import tiles
+from seed_tiles import STUDY_BBOX, seed_tiles, tile_range
+from tiles import tile_bounds
+
+
+def test_tile_range_at_zoom_zero_is_the_world_tile():
+    assert list(tile_range(STUDY_BBOX, 0)) == [(0, 0, 0)]
+
+
+@pytest.mark.parametrize('z', [6, 9, 13])
+def test_tile_range_covers_the_bbox_and_nothing_more(z):
+    tiles = list(tile_range(STUDY_BBOX, z))
+    bounds = [tile_bounds(*tile) for tile in tiles]
+    west, south, east, north = STUDY_BBOX
+
+    # The union of the tiles contains the bbox...
+    assert min(b[0] for b in bounds) <= west and max(b[2] for b in bounds) >= east
+    assert min(b[1] for b in bounds) <= south and max(b[3] for b in bounds) >= north
+    # ...and every tile overlaps it
+    for tile_west, tile_south, tile_east, tile_north in bounds:
+        assert tile_west < east and tile_east > west and tile_south < north and tile_north > south
+    xs = {x for _, x, _ in tiles}
+    ys = {y for _, _, y in tiles}
+    assert len(tiles) == len(xs) * len(ys)
+
+
+def test_tile_range_clamps_to_the_map():
+    tiles = list(tile_range((-180, -89.9, 180, 89.9), 2))
+    assert len(tiles) == 16
+    assert all(0 <= x < 4 and 0 <= y < 4 for _, x, y in tiles)
+    assert math.isclose(tile_bounds(2, 3, 3)[2], 180)
+
+
+class _FakeResponse:
+    status = 200
+    headers = {'Content-Type': 'image/png'}
+    data = b'\x89PNG' + bytes(500)
+
+
+def test_seeding_does_not_rescan_the_tile_cache(tmp_path, monkeypatch):
+    # Every seeded tile is a put; under the cap none of them may scan the cache directory
+    monkeypatch.setattr(tiles, 'tile_cache', disk_cache.DiskCache(str(tmp_path), max_bytes=10 ** 8, compress=False))
+    monkeypatch.setattr(tiles._http, 'request', lambda method, url: _FakeResponse())
+    scans = []
+    listdir = os.listdir
+    monkeypatch.setattr(disk_cache.os, 'listdir', lambda path: scans.append(path) or listdir(path))
+    layer_id = next(iter(tiles.tile_layers()))
+
+    fetched, skipped, failed = seed_tiles([layer_id], zooms=[9, 10], workers=4, rate=0)
+
+    expected = sum(len(list(tile_range(STUDY_BBOX, z))) for z in (9, 10))
+    assert (fetched, skipped, failed) == (expected, 0, 0)
+    assert scans == []
@@ -0,0 +1,38 @@
+import pandas as pd
+from series_cache import SeriesCache
+
+
+def _frame(rows=100):
+    return pd.DataFrame({
+        'time': pd.date_range('2020-01-01', periods=rows, freq='D'),
+        'CHL': pd.Series(range(rows), dtype='float32'),
+    })
+
+
+def test_series_cache_evicts_least_recently_used_by_bytes():
+    df = _frame()
+    nbytes = int(df.memory_usage(index=True, deep=True).sum())
+    cache = SeriesCache(max_bytes=2 * nbytes)
+    cache.put('a', df)
+    cache.put('b', df)
+    cache.get('a')
+    cache.put('c', df)
+
+    assert cache.get('a') is not None and cache.get('c') is not None
+    assert cache.get('b') is None
+    assert cache.stats()['evictions'] == 1
+
+
+def test_series_cache_skips_frames_larger_than_the_budget():
+    cache = SeriesCache(max_bytes=10)
+    cache.put('a', _frame())
+    assert cache.get('a') is None and cache.stats()['bytes'] == 0
+
+
+def test_series_cache_expired_entries_stay_peekable():
+    cache = SeriesCache(max_bytes=10 ** 9, ttl=60)
+    df = _frame()
+    cache.put('a', df, age=120)
+
+    assert cache.get('a') is None
+    assert cache.peek('a') is df
@@ -0,0 +1,33 @@
+import threading
+import time
+from singleflight import SingleFlight
+
+
+def test_single_flight_runs_concurrent_calls_once():
+    flights = SingleFlight()
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def load():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return 'frame'
+
+    results = []
+    leader = threading.Thread(target=lambda: results.append(flights.do('key', load)))
+    leader.start()
+    started.wait(5)
+    followers = [threading.Thread(target=lambda: results.append(flights.do('key', load))) for _ in range(4)]
+    for thread in followers:
+        thread.start()
+    while flights.coalesced < 4:
+        time.sleep(0.01)
+    release.set()
+    for thread in [leader] + followers:
+        thread.join(5)
+
+    assert calls == [1]
+    assert results == ['frame'] * 5
+    assert flights.in_flight() == 0
@@ -0,0 +1,18 @@
+import pytest
+from tiles import tile_bounds
+
+
+def test_tile_bounds_of_the_world_tile():
+    west, south, east, north = tile_bounds(0, 0, 0)
+    assert (west, east) == (-180, 180)
+    # Web Mercator stops at the latitude where the map becomes square
+    assert north == pytest.approx(85.0511287798)
+    assert south == pytest.approx(-85.0511287798)
+
+
+def test_neighbouring_tiles_share_their_edges():
+    z, x, y = 9, 459, 302
+    west, south, east, north = tile_bounds(z, x, y)
+    assert tile_bounds(z, x + 1, y)[0] == pytest.approx(east)
+    assert tile_bounds(z, x, y + 1)[3] == pytest.approx(south)
+    assert west < east and south < north
@@ -0,0 +1,195 @@
+import os
+import sys
+import math
+import json
+import time
+import hashlib
+import threading
+from urllib.parse import urlencode, urlsplit, urlunsplit
+import urllib3
+from disk_cache import DiskCache
+from singleflight import SingleFlight
+from datasets import DATASETS
+
+# Serve map overlays through the local tile cache instead of pointing browsers at the upstream servers
+TILE_PROXY_ENABLED = os.getenv('TILE_PROXY', '1') == '1'
+# Seconds a cached tile is served before it is fetched again (overlays show the latest data)
+TILE_CACHE_TTL = float(os.getenv('TILE_CACHE_TTL', 7 * 24 * 3600))
+# Replaces scheme and host of every upstream URL, e.g. http://localhost:8060 for the stand-in below
+TILE_UPSTREAM = os.getenv('TILE_UPSTREAM')
+TILE_UPSTREAM_CONCURRENCY = int(os.getenv('TILE_UPSTREAM_CONCURRENCY', 8))
+TILE_SIZE = 256
+# Seconds between upstream error reports of a layer; failures in between are only counted
+TILE_ERROR_LOG_INTERVAL = 60
+
+WMTS_URL = (
+    "https://wmts.marine.copernicus.eu/teroWmts?SERVICE=WMTS&REQUEST=GetTile&VERSION=1.0.0"
+    "&LAYER={layer}&FORMAT=image/png&TILEMATRIXSET=EPSG:3857&TILEMATRIX={{z}}&TILEROW={{y}}&TILECOL={{x}}&style={style}"
+)
+
+# PNGs are already compressed, so tiles are stored as they came
+tile_cache = DiskCache(
+    directory=os.getenv('TILE_CACHE_DIR', os.path.join('.cache', 'tiles')),
+    max_bytes=int(os.getenv('TILE_CACHE_MAX_BYTES', 2 * 1024 * 1024 * 1024)),
+    compress=False
+)
+_flights = SingleFlight()
+_upstream_slots = threading.BoundedSemaphore(TILE_UPSTREAM_CONCURRENCY)
+_http = urllib3.PoolManager(maxsize=TILE_UPSTREAM_CONCURRENCY, timeout=urllib3.Timeout(connect=5, read=30), retries=False)
+# Layer id -> (time of its last error report, failures not reported since)
+_error_reports = {}
+_error_lock = threading.Lock()
+
+
+class TileError(Exception):
+    """An upstream tile could not be fetched and no cached copy exists."""
+
+
+def layer_id(layer):
+    """Stable id of an overlay in tile URLs, derived from what the upstream server is asked for."""
+    identity = json.dumps({k: layer.get(k) for k in ('kind', 'url', 'layer', 'layers', 'style')}, sort_keys=True)
+    return hashlib.sha1(identity.encode()).hexdigest()[:12]
+
+
+def tile_layers():
+    """Every overlay in the registry by layer id (layers shared by datasets appear once)."""
+    return {layer_id(layer): layer for dataset in DATASETS.values() for layer in dataset['layers']}
+
+
+_layers = tile_layers()
+
+
+def tile_url(layer):
+    """URL template Leaflet requests the tiles of an overlay from."""
+    return f"/tiles/{layer_id(layer)}/{{z}}/{{x}}/{{y}}.png"
+
+
+def tile_bounds(z, x, y):
+    """(west, south, east, north) in degrees of a Web Mercator tile."""
+    n = 2 ** z
+
+    def lat(row):
+        return math.degrees(math.atan(math.sinh(math.pi * (1 - 2 * row / n))))
+
+    return x / n * 360 - 180, lat(y + 1), (x + 1) / n * 360 - 180, lat(y)
+
+
+def upstream_url(layer, z, x, y, time_value=None):
+    if layer['kind'] == 'wms':
+        west, south, east, north = tile_bounds(z, x, y)
+        params = {
+            'SERVICE': 'WMS', 'REQUEST': 'GetMap', 'VERSION': '1.3.0',
+            'LAYERS': layer['layers'], 'STYLES': '', 'FORMAT': 'image/png', 'TRANSPARENT': 'true',
+            # WMS 1.3.0 orders EPSG:4326 axes latitude first
+            'CRS': 'EPSG:4326', 'BBOX': f'{south},{west},{north},{east}',
+            'WIDTH': TILE_SIZE, 'HEIGHT': TILE_SIZE,
+        }
+        if time_value:
+            params['TIME'] = time_value
+        url = f"{layer['url']}?{urlencode(params)}"
+    else:
+        url = WMTS_URL.format(layer=layer['layer'], style=layer['style']).format(z=z, x=x, y=y)
+        if time_value:
+            url += '&' + urlencode({'time': time_value})
+    if TILE_UPSTREAM:
+        override = urlsplit(TILE_UPSTREAM)
+        url = urlunsplit(urlsplit(url)._replace(scheme=override.scheme, netloc=override.netloc))
+    return url
+
+
+def _cache_key(layer, z, x, y, time_value):
+    return f"{layer_id(layer)}/{layer.get('style') or ''}/{time_value or ''}/{z}/{x}/{y}"
+
+
+def _fresh(cached):
+    return cached is not None and time.time() - cached[1]['validated_at'] <= TILE_CACHE_TTL
+
+
+def is_cached(tile_layer_id, z, x, y, time_value=None):
+    """Whether a fresh copy of the tile is on disk."""
+    return _fresh(tile_cache.get(_cache_key(_layers[tile_layer_id], z, x, y, time_value)))
+
+
+def get_tile(tile_layer_id, z, x, y, time_value=None, refresh=False, raise_on_error=False):
+    """Return the PNG bytes of a tile, from the disk cache while fresh, otherwise from upstream.
+
+    Concurrent requests for the same tile share one upstream fetch. When upstream fails an
+    expired copy is served (unless `raise_on_error`); without any copy TileError is raised.
+    KeyError for unknown layers.
+    """
+    layer = _layers[tile_layer_id]
+    key = _cache_key(layer, z, x, y, time_value)
+    cached = tile_cache.get(key)
+    if not refresh and _fresh(cached):
+        return cached[0]
+    try:
+        return _flights.do(key, _fetch_tile, layer, key, z, x, y, time_value)
+    except TileError:
+        if cached is not None and not raise_on_error:
+            return cached[0]
+        raise
+
+
+def _fetch_tile(layer, key, z, x, y, time_value):
+    url = upstream_url(layer, z, x, y, time_value)
+    try:
+        with _upstream_slots:
+            response = _http.request('GET', url)
+    except urllib3.exceptions.HTTPError as e:
+        _report_error(layer, key, e)
+        raise TileError(key) from e
+    # WMS servers report errors as XML, often with a 200 status; only images are cached
+    content_type = response.headers.get('Content-Type', '')
+    if response.status != 200 or not content_type.startswith('image/'):
+        _report_error(layer, key, f"HTTP {response.status} {content_type}")
+        raise TileError(key)
+    tile_cache.put(key, response.data)
+    return response.data
+
+
+def _report_error(layer, key, reason):
+    # An upstream outage fails every tile of a page at once: print one line per layer and interval
+    tile_layer_id = layer_id(layer)
+    now = time.monotonic()
+    with _error_lock:
+        reported_at, suppressed = _error_reports.get(tile_layer_id, (None, 0))
+        if reported_at is not None and now - reported_at < TILE_ERROR_LOG_INTERVAL:
+            _error_reports[tile_layer_id] = (reported_at, suppressed + 1)
+            return
+        _error_reports[tile_layer_id] = (now, 0)
+    more = f" ({suppressed} more failures of this layer since the last report)" if suppressed else ''
+    print(f"Error fetching tile {key}: {reason}{more}")
+
+
+def stand_in_upstream(port):
+    """Serve a blank transparent PNG for every request, as a local upstream for TILE_UPSTREAM."""
+    import zlib
+    import struct
+    from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+    def chunk(kind, data):
+        return struct.pack('>I', len(data)) + kind + data + struct.pack('>I', zlib.crc32(kind + data))
+
+    rows = b''.join(b'\x00' + b'\x00' * 4 * TILE_SIZE for _ in range(TILE_SIZE))
+    png = (b'\x89PNG\r\n\x1a\n' + chunk(b'IHDR', struct.pack('>IIBBBBB', TILE_SIZE, TILE_SIZE, 8, 6, 0, 0, 0))
+           + chunk(b'IDAT', zlib.compress(rows)) + chunk(b'IEND', b''))
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            self.send_response(200)
+            self.send_header('Content-Type', 'image/png')
+            self.send_header('Content-Length', str(len(png)))
+            self.end_headers()
+            self.wfile.write(png)
+
+    print(f"Stand-in tile upstream on http://localhost:{port}")
+    ThreadingHTTPServer(('', port), Handler).serve_forever()
+
+
+if __name__ == '__main__':
+    if '--stand-in' in sys.argv:
+        port_args = [arg for arg in sys.argv[1:] if arg.isdigit()]
+        stand_in_upstream(int(port_args[0]) if port_args else 8060)
+    else:
+        for tile_layer_id, layer in tile_layers().items():
+            print(tile_layer_id, layer['kind'], layer['name'])
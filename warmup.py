@@ -0,0 +1,120 @@
+import os
+import json
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datasets import iter_series
+
+WARMUP_ENABLED = os.getenv('WARMUP_ON_STARTUP', '1') == '1'
+# Parallel series loads; S3 downloads stay bounded by S3_FETCH_CONCURRENCY as well
+WARMUP_CONCURRENCY = int(os.getenv('WARMUP_CONCURRENCY', 8))
+# Share of the catalogue that must be loaded before /ready reports ready
+WARMUP_READY_THRESHOLD = float(os.getenv('WARMUP_READY_THRESHOLD', 0.9))
+
+
+class Warmup:
+    """Loads the whole catalogue into the caches and mirrors its progress to a JSON file.
+
+    Only one worker per host runs the warm-up, so the other workers read the
+    progress file to answer readiness checks.
+    """
+
+    def __init__(self, path, threshold, enabled=True):
+        self.path = path
+        self.threshold = threshold
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._progress = None
+
+    def run(self, s3_client, bucket, concurrency=WARMUP_CONCURRENCY):
+        """Fetch every series of the catalogue, updating the progress file as each one completes."""
+        # Imported here so readiness checks (and gunicorn.conf.py) do not load the S3 client
+        from s3_fetch import warm_series
+
+        series = list(iter_series())
+        self._start(len(series))
+        with ThreadPoolExecutor(max_workers=max(1, concurrency)) as pool:
+            futures = {pool.submit(warm_series, s3_client, bucket, *entry): entry for entry in series}
+            for future in as_completed(futures):
+                try:
+                    loaded = future.result() is not None
+                except Exception as e:
+                    print(f"Error warming {futures[future]}: {e}")
+                    loaded = False
+                self._advance(loaded)
+        progress = self._finish()
+        print(f"Warm-up loaded {progress['loaded']} of {progress['total']} series in {progress['elapsed']:.1f}s")
+        return progress
+
+    def status(self):
+        """Progress of the current warm-up plus whether the instance is ready for traffic."""
+        if not self.enabled:
+            return {'ready': True, 'enabled': False}
+        progress = self._read()
+        if progress is None:
+            return {'ready': False, 'enabled': True}
+        # Only series actually in the caches count; failures are reported separately in 'failed'
+        fraction = progress['loaded'] / progress['total'] if progress['total'] else 1.0
+        return dict(progress, enabled=True, fraction=fraction, ready=fraction >= self.threshold)
+
+    def ready(self):
+        return self.status()['ready']
+
+    def reset(self):
+        """Forget the progress of a previous run, so a restarted instance is not ready until it warms again."""
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
+
+    def _start(self, total):
+        with self._lock:
+            self._progress = {'total': total, 'loaded': 0, 'failed': 0, 'finished': False,
+                              'started': time.time(), 'elapsed': 0.0}
+            self._write()
+
+    def _advance(self, loaded):
+        with self._lock:
+            self._progress['loaded' if loaded else 'failed'] += 1
+            self._progress['elapsed'] = time.time() - self._progress['started']
+            self._write()
+
+    def _finish(self):
+        with self._lock:
+            self._progress['finished'] = True
+            self._progress['elapsed'] = time.time() - self._progress['started']
+            self._write()
+            return dict(self._progress)
+
+    def _write(self):
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        tmp_path = f'{self.path}.{os.getpid()}.tmp'
+        try:
+            with open(tmp_path, 'w') as f:
+                json.dump(self._progress, f)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f"Error writing warm-up progress: {e}")
+
+    def _read(self):
+        try:
+            with open(self.path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+
+warmup = Warmup(
+    os.getenv('WARMUP_PROGRESS_FILE', os.path.join('.cache', 'warmup.json')),
+    threshold=WARMUP_READY_THRESHOLD,
+    enabled=WARMUP_ENABLED,
+)
+
+
+def start_warmup(s3_client, bucket):
+    """Warm the caches on a background thread; /ready reports ready once the threshold is crossed."""
+    # Progress of a previous run is removed before the thread starts, so it never counts towards readiness
+    warmup.reset()
+    thread = threading.Thread(target=warmup.run, args=(s3_client, bucket), name='warmup', daemon=True)
+    thread.start()
+    return thread